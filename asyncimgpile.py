@@ -0,0 +1,305 @@
+"""
+# Imgpile Custom API (asyncio)
+Same as `imgpile.ImgPile` but every request is a coroutine on a single event loop,
+so hundreds of requests can be in flight without a thread for each one.
+
+### Usage
+1. `Import` the `AsyncImgPile` class in your application
+2. Call `AsyncImgPile().get(url, event)` from a (non-async) thread, or
+`await AsyncImgPile().aget(url)` from a running event loop.
+3. store the response and use however you see fit.
+
+### Output
+> Exactly the same as `ImgPile.get`
+"""
+
+import asyncio
+import aiohttp
+from imgpile import ImgPile
+from queue import Queue
+from threading import Event, Thread
+from time import monotonic
+
+
+class AsyncImgPile(ImgPile):
+    def __init__(self, max_workers: int = 64, per_host_limit: int = 16,
+                 headers=None, timeout=(15, 30), keep_alive: bool = True,
+                 parser: str = "fast", stats=None) -> None:
+        # `max_workers` is the maximum number of requests in flight
+        super().__init__(max_workers=max_workers, per_host_limit=per_host_limit,
+                         headers=headers, timeout=timeout, parser=parser,
+                         stats=stats)
+        self.keep_alive = keep_alive
+        # Image page tasks of the running crawl, not yet consumed
+        self._tasks = None
+
+    def iter_images(self, url: str, event, concurrent: bool = True, known=None, journal=None):
+        """
+        ### Iter Images
+        Runs the scraper on a new event loop (in a background thread) and
+        yields every image's data of `url` in album order.
+
+        Setting `event` cancels the running tasks. `concurrent` is ignored,
+        coroutines are always concurrent.
+        """
+        # Thread event (used to stop the event at user's will.)
+        self.event = event
+
+        # Checkpoint journal, images extracted before the interruption are known
+        self.journal = journal
+        known = dict(known or {})
+        if journal is not None:
+            known.update({self.link_key(link): image_data
+                          for link, image_data in journal.records.items()})
+
+        # New crawl, new retry budget & stats
+        self.retry.reset_budget()
+        self.failed_links = []
+        self.stats.reset()
+
+        # Extracted images, `None` marks the end of the album
+        results = Queue()
+        # Set when the consumer stops early
+        stop = Event()
+        # Holds the exception raised in the event loop (if any)
+        errors = []
+
+        def run_loop():
+            try:
+                asyncio.run(self._stream_cancellable(
+                    url, results, stop, known))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                results.put(None)
+
+        Thread(target=run_loop, daemon=True).start()
+
+        try:
+            while True:
+                image_data = results.get()
+                # Incase, User cancelled the operation
+                if image_data is None or self.event.is_set():
+                    break
+                yield image_data
+        finally:
+            stop.set()
+            self.stats.finish()
+
+        if errors:
+            raise errors[0]
+
+    async def _stream_cancellable(self, url, results: Queue, stop: Event, known=None):
+        """
+        ### Stream Cancellable
+        Puts every image of `aiter_images` into `results`, cancels the
+        task as soon as `self.event` or `stop` is set.
+        """
+        async def produce():
+            async for image_data in self.aiter_images(url, known):
+                results.put(image_data)
+
+        task = asyncio.create_task(produce())
+        watcher = asyncio.create_task(self._watch_event(task, stop))
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        finally:
+            watcher.cancel()
+
+    async def _watch_event(self, task, stop: Event):
+        """Cancels `task` when the user cancels the operation"""
+        while not (self.event.is_set() or stop.is_set()):
+            await asyncio.sleep(0.1)
+        task.cancel()
+
+    async def aget(self, url: str, known=None):
+        """
+        ### Async Get
+        Walks the listing pages of `url` and extracts every image page
+        concurrently. Returns the data in album order.
+        """
+        return [image_data async for image_data in self.aiter_images(url, known)]
+
+    async def aiter_images(self, url: str, known=None):
+        """
+        ### Async Iter Images
+        Walks the listing pages of `url`, extracts every image page
+        concurrently and yields their data in album order as soon as ready.
+
+        Images in `known` (`link_key(image_link) > image data`) are not
+        extracted again.
+        """
+        known = known or {}
+        connector = aiohttp.TCPConnector(limit=self.max_workers,
+                                         limit_per_host=self.per_host_limit,
+                                         force_close=not self.keep_alive)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0],
+                                        sock_read=self.timeout[1])
+
+        async with aiohttp.ClientSession(headers=self.headers,
+                                         connector=connector,
+                                         timeout=timeout,
+                                         trace_configs=[self._connect_trace()]) as session:
+            # Image page tasks in album order, `None` marks the end
+            tasks = self._tasks = asyncio.Queue()
+            walker = asyncio.create_task(
+                self._walk_listing(session, url, tasks, known))
+            try:
+                while True:
+                    task = await tasks.get()
+                    if task is None:
+                        break
+
+                    image_data = await task
+                    if image_data:
+                        yield image_data
+
+                # Raises the error that stopped the walk (album incomplete)
+                await walker
+            finally:
+                walker.cancel()
+                self._tasks = None
+
+    def queue_depth(self):
+        """
+        ### Queue Depth
+        Returns the number of image page tasks of the running crawl not
+        consumed yet (`0` if none is running).
+        """
+        tasks = self._tasks
+        return tasks.qsize() if tasks is not None else 0
+
+    def _connect_trace(self):
+        """
+        ### Connect Trace
+        Returns a `TraceConfig` recording the time spent opening a connection
+        (DNS lookup, TCP & TLS handshake) as the `"connect"` phase.
+        """
+        async def on_start(session, context, params):
+            context.connect_started = monotonic()
+
+        async def on_end(session, context, params):
+            self.stats.record("connect", monotonic() - context.connect_started)
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_start.append(on_start)
+        trace.on_connection_create_end.append(on_end)
+        return trace
+
+    async def _walk_listing(self, session, url, tasks: asyncio.Queue, known):
+        """
+        ### Walk Listing
+        Walks the listing pages of `url` and puts a task for every image page
+        in `tasks` as soon as its listing page is parsed. Raises the error of
+        a listing page that can't be fetched.
+        """
+        try:
+            # Links of journaled pages & the page to continue from
+            links, page, visited = self._resume_listing(url)
+            self._put_image_tasks(session, links, tasks, known)
+
+            while page and page not in visited:
+                visited.add(page)
+                html = await self._fetch(session, page, raise_errors=True)
+
+                self.stats.count("listing_pages")
+                next_page, links = self.parse_listing_page(html)
+                if self.journal is not None:
+                    self.journal.page(page, links, next_page)
+                self._put_image_tasks(session, links, tasks, known)
+                page = next_page
+        finally:
+            tasks.put_nowait(None)
+
+    def _put_image_tasks(self, session, links, tasks: asyncio.Queue, known):
+        """
+        ### Put Image Tasks
+        Puts a task extracting every image page of `links` in `tasks`.
+        """
+        for link in links:
+            if not (link and type(link) == str):
+                continue
+
+            # Already known images are not extracted again
+            image_data = known.get(self.link_key(link))
+            if image_data:
+                task = asyncio.get_running_loop().create_future()
+                task.set_result(image_data)
+            else:
+                task = asyncio.create_task(
+                    self._extract_image_data(session, link))
+            tasks.put_nowait(task)
+
+    async def _fetch(self, session, url, raise_errors: bool = False):
+        """
+        ### Fetch
+        Returns the text of `url` or `None` if request failed or answered with
+        an error status (the error is raised instead if `raise_errors`).
+
+        Failed requests are retried according to `self.retry`.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._fetch_once(session, url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+
+            # Timeouts & connection errors are retryable, statuses per policy
+            retryable = self.retry.is_retryable(status=error.status) \
+                if isinstance(error, aiohttp.ClientResponseError) else True
+            attempt += 1
+            if not retryable or attempt >= self.retry.max_attempts or \
+                    not self.retry.spend():
+                if raise_errors:
+                    raise error
+                print(error)
+                return None
+
+            await asyncio.sleep(self.retry.backoff(attempt - 1))
+
+    async def _fetch_once(self, session, url):
+        """
+        ### Fetch Once
+        Sends a single GET request to `url` and returns its text, raises the
+        error of a failed request or an error status.
+        """
+        started = monotonic()
+        async with session.get(url) as response:
+            self.stats.record("ttfb", monotonic() - started)
+            with self.stats.timer("transfer"):
+                body = await response.read()
+            self.stats.count("requests")
+            self.stats.count("scraped_bytes", len(body))
+            # An error page is no page of the album
+            response.raise_for_status()
+
+        return body.decode(response.get_encoding(), errors="replace")
+
+    async def _extract_image_data(self, session, image_url):
+        """
+        ### Extract Image Data
+        extracts all the image data and returns it as a dictionary,
+        returns `None` if anything goes wrong.
+        """
+        html = await self._fetch(session, image_url)
+        if html is None:
+            self.failed_links.append(image_url)
+            self.stats.count("failed_images")
+            return None
+
+        self.stats.count("image_pages")
+        try:
+            image_data = self.parse_image_data(html)
+        except Exception:
+            # if anything goes wrong, skip it (but remember it)
+            self.failed_links.append(image_url)
+            self.stats.count("failed_images")
+            return None
+
+        self.stats.count("images")
+        if self.journal is not None:
+            self.journal.record(image_url, image_data)
+        return image_data
@@ -3,24 +3,263 @@ Handles all the backend logics
 """
 
 from imgpile import ImgPile
+from httpcache import HttpCache
+from ratelimit import AdaptiveLimiter, RequestCancelled
+from cancel import CancellableAdapter, cancel_scope, connect_time
+from journal import CrawlJournal
+from stats import CrawlStats
+from manifest import DownloadManifest
+from filenames import FilenameAllocator
+from scheduler import TokenBucket, order_downloads
 import requests
+from requests.exceptions import ChunkedEncodingError
 import os
 from os import path
 import json
-import pandas as pd
+import re
+import hashlib
+from queue import Empty, Queue
+from threading import Event, Lock, Thread
+from time import monotonic, perf_counter
 
 
 class Backend:
-    def __init__(self):
-        self.img_api = ImgPile()
-        pass
+    # Downloads are streamed to disk in chunks of this many bytes
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
 
-    def get_response(self, url, event):
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 4, engine: str = "sync",
+                 pool_size: int = 16, keep_alive: bool = True, headers=None, timeout=(15, 30),
+                 parser: str = "fast", cache_dir: str = "cache", hedge: bool = False,
+                 journal_dir: str = "journals", download_workers: int = 8,
+                 store_dir: str = None, link_mode: str = "auto",
+                 bandwidth_limit: float = None):
+        # * HTTP Configuration (shared by the scraper & the downloaders)
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.headers = headers or {'User-Agent': 'Mozilla/5.0'}
+        # Timeout values:> connect timout, read timeout
+        self.timeout = timeout
+        self.session = self.create_session()
+        # On-disk cache of scraped pages (`cache_dir=None` disables it)
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        # Checkpoint journals of interrupted scrapes (`None` disables them)
+        self.journal_dir = journal_dir
+
+        # Adaptive concurrency limit of every host (scraper & downloader),
+        # never more than `per_host_limit` requests to a single host at once
+        self.limiter = AdaptiveLimiter(maximum=per_host_limit)
+
+        # Images downloaded at once (each host still within its limit)
+        self.download_workers = download_workers
+        # Work queue of the running download (see `download_images`)
+        self._download_queue = None
+        # Persistent queue of album downloads (see `open_download_queue`)
+        self.download_queue = None
+        # Bytes per second of all downloads together (`None` for no cap),
+        # change `self.bandwidth.rate` to change it while downloading
+        self.bandwidth = TokenBucket(bandwidth_limit)
+        # Download manifests of the destination folders (folder > manifest)
+        self._manifests = {}
+        self._manifests_lock = Lock()
+        # Content-addressed store of downloaded images (`None` disables it),
+        # an image is kept once & linked into every album folder
+        self.store = None
+        if store_dir:
+            from imagestore import ImageStore
+            self.store = ImageStore(store_dir, link_mode)
+
+        # Per-phase timings & counters of the last scrape & of the downloads
+        self.stats = CrawlStats()
+        self.download_stats = CrawlStats()
+
+        # `max_workers` image pages are scraped at once
+        self.img_api = ImgPile(max_workers=max_workers,
+                               per_host_limit=per_host_limit,
+                               session=self.session,
+                               headers=self.headers,
+                               timeout=self.timeout,
+                               parser=parser,
+                               cache=self.cache,
+                               limiter=self.limiter,
+                               hedge=hedge,
+                               stats=self.stats)
+        self.async_img_api = None
+        # Metrics exporter (see `start_metrics`)
+        self.metrics = None
+
+        # Default scraping engine: "sync" or "async"
+        self.engine = engine
+
+    def create_session(self):
+        """ 
+        ### Create Session
+        Creates a `requests.Session` with a connection pool of `self.pool_size`
+        connections per host, default headers & keep-alive.
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        # Connection pool (requests can be aborted when the user cancels)
+        adapter = CancellableAdapter(pool_connections=self.pool_size,
+                                     pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+    def get_response(self, url, event, engine=None, resume=True):
         """ 
         ### Get Response
         This method talks directly to the API and returns a response from it
+
+        `engine` selects the scraper: `"sync"` (threads) or `"async"` (asyncio),
+        defaults to `self.engine`.
+
+        if `resume` is `True`, an interrupted scrape of the same `url` resumes
+        from its checkpoint journal instead of starting over.
+        """
+        journal = self.open_journal(url) if resume else None
+        result = None
+        try:
+            result = self.get_api(engine).get(url, event, journal=journal)
+            return result
+        finally:
+            self.close_journal(journal, url, completed=result is not None)
+
+    def stream_response(self, url, event, engine=None, resume=True):
+        """ 
+        ### Stream Response
+        Same as `get_response` but yields every image's data (in album order)
+        as soon as it is scraped.
+        """
+        journal = self.open_journal(url) if resume else None
+        completed = False
+        try:
+            yield from self.get_api(engine).iter_images(url, event, journal=journal)
+            completed = not event.is_set()
+        finally:
+            self.close_journal(journal, url, completed)
+
+    def get_incremental_response(self, url, event, snapshot: list, engine=None, resume=True):
+        """ 
+        ### Get Incremental Response
+        Re-scrapes album `url` against a previous `snapshot` of it (e.g. from
+        `get_presaved_data`), only the images missing from `snapshot` are
+        scraped.
+
+        Returns a tuple of `(merged, delta)`, `merged` being the whole album
+        (in album order) and `delta` the newly scraped images only, or `None`
+        if user cancelled.
+        """
+        api = self.get_api(engine)
+        known = {api.link_key(image['image_link']): image
+                 for image in snapshot or [] if image.get('image_link')}
+
+        journal = self.open_journal(url) if resume else None
+        merged = None
+        try:
+            merged = api.get(url, event, known=known, journal=journal)
+        finally:
+            self.close_journal(journal, url, completed=merged is not None)
+
+        if merged is None:
+            return None
+
+        delta = [image for image in merged
+                 if api.link_key(image['image_link']) not in known]
+        return merged, delta
+
+    def open_journal(self, url):
+        """ 
+        ### Open Journal
+        Returns the checkpoint journal of album `url` (`None` if journaling is
+        disabled).
+        """
+        if not self.journal_dir:
+            return None
+        return CrawlJournal.for_url(self.journal_dir, url)
+
+    def close_journal(self, journal, url, completed: bool):
+        """ 
+        ### Close Journal
+        Deletes the `journal` of album `url` once the scrape is `completed`
+        and its listing reached the last page (no next page link), otherwise
+        keeps it (flushed) to resume from next time.
         """
-        return self.img_api.get(url, event)
+        if journal is None:
+            return
+
+        if completed and journal.listing_complete(url):
+            journal.delete()
+        else:
+            journal.close()
+
+    def get_api(self, engine=None):
+        """ 
+        ### Get API
+        Returns the scraper for `engine` (`"sync"` or `"async"`), defaults
+        to `self.engine`.
+        """
+        engine = engine or self.engine
+
+        if engine == "sync":
+            return self.img_api
+
+        elif engine == "async":
+            return self.get_async_api()
+
+        else:
+            raise ValueError(
+                "Invalid Engine: engine must be 'sync' or 'async'.")
+
+    def get_async_api(self):
+        """ 
+        ### Get Async API
+        Returns the asyncio scraper, importing it (and `aiohttp`) on first use
+        """
+        if self.async_img_api is None:
+            from asyncimgpile import AsyncImgPile
+            self.async_img_api = AsyncImgPile(max_workers=self.img_api.max_workers,
+                                              per_host_limit=self.img_api.per_host_limit,
+                                              headers=self.headers,
+                                              timeout=self.timeout,
+                                              keep_alive=self.keep_alive,
+                                              parser=self.img_api.parser,
+                                              stats=self.stats)
+        return self.async_img_api
+
+    def get_rate_limit_stats(self):
+        """ 
+        ### Get Rate Limit Stats
+        Returns the current concurrency limit, counters & latest decisions of
+        every host the scraper or downloader talked to.
+        """
+        return self.limiter.stats()
+
+    def start_metrics(self, port: int = None, dump_path: str = None, interval: float = 10.0):
+        """ 
+        ### Start Metrics
+        Starts exporting the metrics of the scraper & downloader, served on
+        `127.0.0.1:port` (if `port`) and dumped as json to `dump_path` (if
+        given) every `interval` seconds. Returns the `metrics.MetricsExporter`.
+        """
+        from metrics import MetricsExporter
+
+        self.stop_metrics()
+        self.metrics = MetricsExporter(self, port=port, dump_path=dump_path,
+                                       interval=interval).start()
+        return self.metrics
+
+    def stop_metrics(self):
+        """ 
+        ### Stop Metrics
+        Stops the metrics exporter (if running).
+        """
+        if self.metrics is not None:
+            self.metrics.stop()
+            self.metrics = None
 
     def get_presaved_data(self, filepath: str) -> list:
         """ 
@@ -97,6 +336,24 @@ class Backend:
         # Calculate and return bytes
         return round(factors[unit] * size, 3)
 
+    def parse_size(self, size: str):
+        """
+        ### Parse Size
+        Converts a size like `"32.2 MB"` (or `"32.2MB"`) to bytes, raises
+        `ValueError` if it is not one.
+        """
+        match = re.fullmatch(r"\s*([\d.]+)\s*([A-Za-z]{1,2})\s*", size or "")
+        if not match:
+            raise ValueError(f"'{size}' is not a valid size")
+        return self.to_bytes(float(match.group(1)), match.group(2).upper())
+
+    def image_size(self, image: dict):
+        """Returns the size of a scraped `image` in bytes (`0` if unknown)"""
+        try:
+            return self.parse_size(image.get('size'))
+        except (ValueError, KeyError):
+            return 0
+
     def to_human_readable_storage(self, bytes_size):
         """ 
         ### To Human Readable Storage
@@ -137,29 +394,14 @@ class Backend:
         if not path.exists(filepath):
             return filepath
 
-        # Extract filename and extension
-        filename = path.splitext(path.basename(filepath))[0]
-        ext = path.splitext(filepath)[-1]
-
         # Set root path
         if dst_path == "":
             root = path.split(filepath)[0]
         else:
             root = dst_path
 
-        # Creating new_name
-        new_name = path.join(root, filename + ext)
-
-        # If file exists, Increment
-        if path.exists(new_name):
-            i = 0
-            while (i >= 0):
-                new_name = f"{path.join(root, filename)} {i}{ext}"
-                if not path.exists(new_name):
-                    return new_name
-                i += 1
-        else:
-            return new_name
+        # One scan of `root` instead of a probe per number
+        return path.join(root, FilenameAllocator(root).allocate(path.basename(filepath)))
 
     def sanitize_string(self, string: str):
         """ 
@@ -180,6 +422,21 @@ class Backend:
 
         return sanitized_string
 
+    def image_url_and_filename(self, image: dict, image_quality: str = "High Quality"):
+        """ 
+        ### Image URL and Filename
+        Returns the url & the filename to download a scraped `image` with, in
+        `image_quality` ("High Quality" or "Low Quality").
+        """
+        if image_quality == "High Quality":
+            filename = self.sanitize_string(image['title']) + image['extension']
+            image_url = image['image_url']
+        else:
+            filename = f"{self.sanitize_string(image['title'])}_Lq_{image['extension']}"
+            image_url = image['lq_url']
+
+        return image_url, filename
+
     def download_image(self, image_url, filename, save_path, event):
         """Downloads all images in local storage"""
         # URL Check
@@ -195,18 +452,290 @@ class Backend:
         # Create a dirpath, also check if it already exists
         directory = path.join(save_path, filename)
 
-        # If file does not exists, download
+        # If file does not exists, download (a partial download is never
+        # at `directory`, it only gets there once complete)
         if not path.isfile(directory):
-            # Download the image content
-            raw_image_data = requests.get(image_url).content
+            # Already in the store, no need to download it again
+            digest = self.store.lookup(image_url) if self.store else None
+            if digest:
+                self.store.place(digest, directory)
+                self.download_stats.count("deduplicated_images")
+                return
 
-            # If user cancelled
-            if event.is_set():
+            # Stream the image to disk (aborted as soon as user cancels)
+            try:
+                saved = self._download_to_file(image_url, directory, event)
+            except RequestCancelled:
                 return
 
-            # Save image
-            with open(directory, 'wb') as img:
-                img.write(raw_image_data)
+            if saved:
+                self.download_stats.count("images")
+        else:
+            self.download_stats.count("skipped_images")
+
+    def download_images(self, images: list, image_quality: str, save_path: str, event,
+                        step_callback=None, workers: int = None, album: str = "",
+                        order: str = "order", pinned=(), bandwidth_limit: float = None):
+        """ 
+        ### Download Images
+        Downloads `images` (scraped data) in `image_quality` into `save_path`
+        with `workers` (default: `self.download_workers`) threads pulling from
+        a work queue, every host within its limit.
+
+        The work is planned from the folder's manifest (see `open_manifest`):
+        images it holds as complete are skipped if the folder (scanned once)
+        still has their file.
+        `album` labels the images in the manifest (see `get_missing_report`).
+
+        The rest is downloaded in `order` by size, `"order"` (as scraped),
+        `"smallest"` or `"largest"` first, the images whose `image_link` is
+        in `pinned` before all others (see `scheduler.order_downloads`).
+        `bandwidth_limit` caps this download to as many bytes per second, on
+        top of the cap of every download (`self.bandwidth`).
+
+        `step_callback(total, completed)` is called after every image, with
+        `completed` counting up one by one. Returns when every image is done,
+        or as soon as `event` is set. The first error stops the download and
+        is raised.
+        """
+        workers = max(1, min(workers or self.download_workers, len(images) or 1))
+        total = len(images)
+
+        manifest, allocator, planned, skipped = self.plan_downloads(
+            images, image_quality, save_path, album, order, pinned)
+        # Work queue of (image url, filename)
+        work = self._download_queue = Queue()
+        for item in planned:
+            work.put(item)
+        # Cap of this download only
+        bucket = TokenBucket(bandwidth_limit) if bandwidth_limit else None
+        self.download_stats.reset()
+        self.download_stats.count("skipped_images", skipped)
+
+        # Set by the first failing worker, stops the others
+        failed = Event()
+        errors = []
+        progress_lock = Lock()
+        completed = 0
+
+        # Already complete images count as done right away
+        if step_callback is not None:
+            for completed in range(1, skipped + 1):
+                step_callback(total, completed)
+        completed = skipped
+
+        def worker():
+            nonlocal completed
+            while not (event.is_set() or failed.is_set()):
+                try:
+                    image_url, filename = work.get_nowait()
+                except Empty:
+                    return
+
+                try:
+                    self._download_planned(manifest, allocator, image_url,
+                                           filename, save_path, event, bucket)
+                except Exception as e:
+                    errors.append(e)
+                    failed.set()
+                    return
+
+                if event.is_set():
+                    return
+
+                # Progress is reported in order: 1, 2, 3...
+                with progress_lock:
+                    completed += 1
+                    if step_callback is not None:
+                        step_callback(total, completed)
+
+        threads = [Thread(target=worker, daemon=True) for _ in range(workers)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            self._download_queue = None
+            self.download_stats.finish()
+
+        if errors:
+            raise errors[0]
+
+    def plan_downloads(self, images: list, image_quality: str, save_path: str,
+                       album: str = "", order: str = "order", pinned=()):
+        """ 
+        ### Plan Downloads
+        Plans the download of `images` into `save_path` (see `download_images`)
+        and returns `(manifest, allocator, work, skipped)`: the folder's
+        manifest & filename allocator, the `(image url, filename)` left to
+        download in order, and the number of images already complete.
+        """
+        if not path.isdir(save_path):
+            raise ValueError(
+                "Backend.download_images(): `save_path` must be an existing directory")
+
+        # * One query tells what is already complete
+        manifest = self.open_manifest(save_path)
+        planned = [self.image_url_and_filename(image, image_quality) for image in images]
+        complete = manifest.plan([url for url, _ in planned if url], album)
+        # Names of new images come from one scan of the folder
+        allocator = FilenameAllocator(save_path, manifest.filenames())
+
+        # Complete images deleted since are downloaded again (same scan)
+        deleted = [url for url, _ in planned
+                   if url in complete and not allocator.on_disk(complete[url])]
+        if deleted:
+            manifest.reopen(deleted)
+            for url in deleted:
+                del complete[url]
+
+        pending = [(self.image_size(image), image.get('image_link'), planned[index])
+                   for index, image in enumerate(images)
+                   if planned[index][0] not in complete]
+        work = [item for _, _, item in order_downloads(pending, order, pinned)]
+        return manifest, allocator, work, len(images) - len(pending)
+
+    def _download_planned(self, manifest, allocator, image_url: str, filename: str,
+                          save_path: str, event, bucket=None):
+        """ 
+        ### Download Planned
+        Downloads one image of a planned run into `save_path` (named by
+        `allocator` if new, throttled by `bucket` if given) and records it in
+        `manifest` once complete.
+
+        Returns `True` once the image is complete, `False` if it isn't (no
+        URL, an error answer or cancelled).
+        """
+        # URL Check
+        if not image_url:
+            print(f"Image: '{filename}' has no URL on website, **Skipping**")
+            return False
+
+        # An interrupted download keeps its name (and its partial file)
+        reserved = manifest.filename(image_url)
+        if reserved is None:
+            filename = self._claim_filename(manifest, allocator, image_url, filename)
+            filepath = path.join(save_path, filename)
+
+            # Downloaded before the folder had a manifest, adopted only if
+            # whole (a truncated leftover is downloaded again over it)
+            if allocator.on_disk(filename) and path.isfile(filepath) and \
+                    self._remote_length(image_url, event) == path.getsize(filepath):
+                manifest.complete(image_url, filename, path.getsize(filepath))
+                self.download_stats.count("skipped_images")
+                return True
+        else:
+            filename = reserved
+            filepath = path.join(save_path, filename)
+
+        # Already in the store, no need to download it again
+        digest = self.store.lookup(image_url) if self.store else None
+        if digest:
+            self.store.place(digest, filepath)
+            self.download_stats.count("deduplicated_images")
+        else:
+            # Stream the image to disk (aborted as soon as user cancels)
+            try:
+                digest = self._download_to_file(image_url, filepath, event, bucket)
+            except RequestCancelled:
+                return False
+            if not digest:
+                return False
+            self.download_stats.count("images")
+
+        manifest.complete(image_url, filename, path.getsize(filepath), digest)
+        return True
+
+    def _remote_length(self, url: str, event=None):
+        """ 
+        ### Remote Length
+        Returns the byte length of `url` from a `HEAD` request (within its
+        host's limit), `None` if unknown or the request failed.
+        """
+        try:
+            with self.limiter.slot(url, event) as slot, cancel_scope(event):
+                response = self.session.head(url, timeout=self.timeout,
+                                             allow_redirects=True)
+                slot.done(response)
+                response.close()
+        except (requests.RequestException, RequestCancelled) as e:
+            print(e)
+            return None
+
+        length = response.headers.get("Content-Length")
+        if not response.ok or not (length and length.isdigit()) or \
+                "Content-Encoding" in response.headers:
+            return None
+        return int(length)
+
+    def _claim_filename(self, manifest, allocator, image_url: str, filename: str):
+        """ 
+        ### Claim Filename
+        Reserves `filename` for `image_url` in `manifest`, or the first free
+        `"filename {i}.ext"` (see `FilenameAllocator`) if it is in use.
+        """
+        # A whole file on disk with this name is adopted (see `_download_planned`)
+        name = allocator.allocate(filename, adopt=True)
+        # ? Only fails if another run took the name since the folder was scanned
+        while not manifest.claim(image_url, name):
+            name = allocator.allocate(filename)
+        return name
+
+    def open_manifest(self, save_path: str):
+        """ 
+        ### Open Manifest
+        Returns the download manifest of folder `save_path` (opened once).
+        """
+        key = path.abspath(save_path)
+        with self._manifests_lock:
+            if key not in self._manifests:
+                self._manifests[key] = DownloadManifest(save_path)
+            return self._manifests[key]
+
+    def get_missing_report(self, save_path: str, album: str = None,
+                           verify: bool = False):
+        """ 
+        ### Get Missing Report
+        Returns what is missing in `save_path` (of `album` only, if given):
+        a summary (`complete`, `pending` & complete `bytes`) and the rows
+        (`url`, `filename`, `state`) not downloaded yet.
+
+        With `verify`, complete files missing or truncated on disk are marked
+        pending first (so the next download run fetches them again).
+        """
+        manifest = self.open_manifest(save_path)
+        if verify:
+            manifest.verify()
+        return {"summary": manifest.summary(album),
+                "missing": manifest.missing(album)}
+
+    def download_queue_depth(self):
+        """ 
+        ### Download Queue Depth
+        Returns the number of images waiting for a worker in the running
+        download & in the download queue (`0` if none).
+        """
+        work = self._download_queue
+        depth = work.qsize() if work is not None else 0
+        if self.download_queue is not None:
+            depth += self.download_queue.pending()
+        return depth
+
+    def open_download_queue(self, state_dir: str = "downloads", workers: int = None,
+                            start: bool = True):
+        """ 
+        ### Open Download Queue
+        Returns the persistent queue of album downloads in `state_dir` (see
+        `jobqueue.DownloadQueue`), opened once. Its workers are started
+        unless `start` is `False`, jobs left running continue right away.
+        """
+        if self.download_queue is None:
+            from jobqueue import DownloadQueue
+            self.download_queue = DownloadQueue(self, state_dir, workers)
+            if start:
+                self.download_queue.start()
+        return self.download_queue
 
     def download_data(self, data, fileformat, filename, save_path, download_complete_callback):
         """ 
@@ -226,6 +755,9 @@ class Backend:
 
         elif fileformat == "CSV":
             # * Download as CSV
+            # Pandas is heavy, only imported when needed
+            import pandas as pd
+
             # Convert to Pandas Dataframe
             df = pd.DataFrame(data)
             # Save Dataframe as CSV
@@ -247,6 +779,249 @@ class Backend:
         if not path.isdir(save_path):
             os.mkdir(save_path)
 
-        raw_data = requests.get(thumb_url).content
-        with open(f"{save_path}\\{thumb_name}", "wb") as thumb:
-            thumb.write(raw_data)
+        if self._download_to_file(thumb_url, f"{save_path}\\{thumb_name}"):
+            self.download_stats.count("thumbnails")
+
+    def _download_to_file(self, url: str, filepath: str, event=None, bucket=None):
+        """ 
+        ### Download to File
+        Streams `url` (through the shared session, within its host's limit)
+        into `filepath` in chunks of `DOWNLOAD_CHUNK_SIZE` bytes, timing it in
+        `self.download_stats`.
+
+        The body goes to `filepath + ".part"` first, which is synced and then
+        renamed to `filepath` in one step once complete, so `filepath` never
+        holds a partial file. An interrupted `.part` file is kept (with a
+        sidecar, see `_write_sidecar`) and continued with a `Range` request
+        next time, or downloaded again in full if the server ignores ranges
+        or the image changed.
+
+        The transfer is throttled by `self.bandwidth` & `bucket` (if given).
+
+        Returns the SHA-256 digest of the image, or `None` (nothing written)
+        if the server answered with an error. Raises `RequestCancelled` as
+        soon as `event` is set, even halfway through the body.
+        """
+        temp_path = filepath + ".part"
+        # Images are hashed while they stream in (manifest & store)
+        hasher = hashlib.sha256()
+        saved = self._stream_to_part(url, temp_path, event, hasher, bucket)
+        if saved is None:
+            # Partial file can't be continued, start over
+            self._discard_partial(temp_path)
+            hasher = hashlib.sha256()
+            saved = self._stream_to_part(url, temp_path, event, hasher, bucket)
+
+        if not saved:
+            return None
+
+        digest = hasher.hexdigest()
+        if self.store is not None:
+            # Kept once in the store, linked into place
+            self.store.put(temp_path, digest, url)
+            self.store.place(digest, filepath)
+        else:
+            os.replace(temp_path, filepath)
+        self._discard_partial(temp_path)
+        return digest
+
+    def _stream_to_part(self, url: str, temp_path: str, event=None, hasher=None,
+                        bucket=None):
+        """ 
+        ### Stream to Part
+        Downloads `url` into `temp_path`, continuing it from where it stopped
+        if possible. Returns `True` once complete, `False` if the server
+        answered with an error or `None` if the partial file can't be
+        continued (range refused or mismatching).
+
+        Every byte of the file is fed to `hasher` (if given).
+        """
+        sidecar = self._read_sidecar(temp_path, url)
+        offset = path.getsize(temp_path) \
+            if sidecar is not None and path.isfile(temp_path) else 0
+        headers = self._range_headers(sidecar, offset) if offset else None
+
+        with self.limiter.slot(url, event) as slot, cancel_scope(event):
+            # Forget the connects of requests sent outside of the stats
+            connect_time()
+            started = monotonic()
+            response = self.session.get(url, headers=headers, timeout=self.timeout,
+                                        stream=True)
+            self.download_stats.record("ttfb", monotonic() - started)
+            connected = connect_time()
+            if connected:
+                self.download_stats.record("connect", connected)
+            slot.done(response)
+            self.download_stats.count("requests")
+
+            with response:
+                if offset and response.status_code == 416:
+                    return None
+
+                if not response.ok:
+                    print(f"'{url}' answered {response.status_code}, **Skipping**")
+                    return False
+
+                if response.status_code == 206:
+                    # Continue the partial file (only from the right byte)
+                    if not self._continues(response, offset, sidecar):
+                        return None
+                    self.download_stats.count("resumed_downloads")
+                    self.download_stats.count("resumed_bytes", offset)
+                    if hasher is not None:
+                        self._hash_file(temp_path, hasher)
+                else:
+                    # Whole body: range ignored, image changed or a new download
+                    offset = 0
+                    sidecar = self._write_sidecar(temp_path, url, response)
+
+                try:
+                    self._write_chunks(response, temp_path, event,
+                                       append=offset > 0, hasher=hasher, bucket=bucket)
+                except BaseException:
+                    # Keep what was downloaded only if it can be continued
+                    if not sidecar['resumable']:
+                        self._discard_partial(temp_path)
+                    raise
+
+        return True
+
+    def _hash_file(self, filepath: str, hasher):
+        """Feeds the bytes of `filepath` to `hasher` (chunk by chunk)"""
+        with open(filepath, "rb") as file:
+            for chunk in iter(lambda: file.read(self.DOWNLOAD_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+
+    def _range_headers(self, sidecar: dict, offset: int):
+        """ 
+        ### Range Headers
+        Returns the headers continuing a partial download at byte `offset`,
+        `If-Range` makes the server send the whole (new) image if it changed.
+        """
+        headers = {"Range": f"bytes={offset}-"}
+        # Weak ETags are not allowed in If-Range
+        etag = sidecar.get('etag')
+        if etag and not etag.startswith("W/"):
+            headers['If-Range'] = etag
+        elif sidecar.get('last_modified'):
+            headers['If-Range'] = sidecar['last_modified']
+        return headers
+
+    @staticmethod
+    def _continues(response, offset: int, sidecar: dict):
+        """ 
+        ### Continues
+        Returns `True` if the `206` `response` continues the partial file at
+        `offset` of the same image (same total length).
+        """
+        match = re.match(r"bytes (\d+)-\d+/(\d+|\*)",
+                         response.headers.get("Content-Range", ""))
+        if not match or int(match.group(1)) != offset:
+            return False
+
+        total = match.group(2)
+        length = sidecar.get('length')
+        return total == "*" or length is None or int(total) == length
+
+    def _read_sidecar(self, temp_path: str, url: str):
+        """ 
+        ### Read Sidecar
+        Returns the sidecar of the partial download `temp_path` of `url`, or
+        `None` if there is none (or it belongs to another url).
+        """
+        try:
+            with open(temp_path + ".json") as sidecar_file:
+                sidecar = json.load(sidecar_file)
+        except (OSError, ValueError):
+            return None
+
+        if sidecar.get('url') != url or not sidecar.get('resumable'):
+            return None
+        return sidecar
+
+    def _write_sidecar(self, temp_path: str, url: str, response):
+        """ 
+        ### Write Sidecar
+        Writes (and returns) the sidecar of a new partial download: its `url`,
+        expected `length` & validators (`etag`, `last_modified`).
+        """
+        length = response.headers.get("Content-Length")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        sidecar = {
+            "url": url,
+            "length": int(length) if length and length.isdigit() and
+            "Content-Encoding" not in response.headers else None,
+            "etag": etag,
+            "last_modified": last_modified,
+            # Worth keeping only if the server can continue it
+            "resumable": response.headers.get("Accept-Ranges") == "bytes" or
+            bool(etag or last_modified),
+        }
+        with open(temp_path + ".json", "w") as sidecar_file:
+            json.dump(sidecar, sidecar_file)
+        return sidecar
+
+    @staticmethod
+    def _discard_partial(temp_path: str):
+        """Removes a partial download (`.part` file & its sidecar)"""
+        for filepath in (temp_path, temp_path + ".json"):
+            if path.isfile(filepath):
+                os.remove(filepath)
+
+    def _write_chunks(self, response, temp_path: str, event=None, append: bool = False,
+                      hasher=None, bucket=None):
+        """ 
+        ### Write Chunks
+        Writes (or appends, if `append`) the body of a streamed `response`
+        into `temp_path` chunk by chunk (constant memory) and syncs it to disk.
+        Every chunk is fed to `hasher` (if given) and paid for in
+        `self.bandwidth` & `bucket` (if given) before the next one is read.
+        """
+        written = 0
+        # Time spent waiting for the network, writing to disk & throttled
+        transfer_seconds = write_seconds = throttle_seconds = 0.0
+        with open(temp_path, "ab" if append else "wb") as temp:
+            chunks = response.iter_content(self.DOWNLOAD_CHUNK_SIZE)
+            while True:
+                started = perf_counter()
+                chunk = next(chunks, None)
+                transfer_seconds += perf_counter() - started
+                if chunk is None:
+                    break
+
+                if event is not None and event.is_set():
+                    raise RequestCancelled(response.url)
+
+                if hasher is not None:
+                    hasher.update(chunk)
+
+                started = perf_counter()
+                temp.write(chunk)
+                write_seconds += perf_counter() - started
+                written += len(chunk)
+                self.download_stats.count("downloaded_bytes", len(chunk))
+
+                # Bandwidth caps, the socket isn't read while waiting
+                started = perf_counter()
+                self.bandwidth.consume(len(chunk), event)
+                if bucket is not None:
+                    bucket.consume(len(chunk), event)
+                throttle_seconds += perf_counter() - started
+
+            started = perf_counter()
+            temp.flush()
+            os.fsync(temp.fileno())
+            write_seconds += perf_counter() - started
+
+        self.download_stats.record("transfer", transfer_seconds)
+        self.download_stats.record("write", write_seconds)
+        if self.bandwidth.rate or bucket is not None:
+            self.download_stats.record("throttle", throttle_seconds)
+
+        # Connection closed early without an error (older urllib3 doesn't check)
+        expected = response.headers.get("Content-Length")
+        if expected and expected.isdigit() and written < int(expected) and \
+                "Content-Encoding" not in response.headers:
+            raise ChunkedEncodingError(
+                f"'{response.url}' ended after {written} of {expected} bytes")
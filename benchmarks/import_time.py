@@ -0,0 +1,98 @@
+"""
+# Import-Time Benchmark
+Measures the cold-start (import) cost of every module of this project and
+fails when a module exceeds its budget.
+
+### Usage
+> `python benchmarks/import_time.py [--runs 5] [--json results.json]`
+
+Every module is imported in a fresh interpreter (`python -X importtime`)
+`runs` times, the fastest run counts. Exit code is `1` if any budget is
+exceeded. Modules whose dependencies are missing are reported & skipped.
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Project root (modules of this project live there)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budgets in milliseconds
+BUDGETS = {
+    "imgcrawler": 25,
+    "journal": 25,
+    "httpcache": 25,
+    "retry": 150,
+    "ratelimit": 150,
+    "imgpile": 200,
+    "backend": 250,
+    "asyncimgpile": 400,
+    "frontend": 1000,
+}
+
+# Last line of `-X importtime` is the module itself: "... | cumulative | name"
+IMPORTTIME_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def measure(module: str, runs: int):
+    """
+    ### Measure
+    Returns the fastest import time of `module` in milliseconds, or `None` if
+    it cannot be imported here.
+    """
+    timings = []
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                 cwd=ROOT, capture_output=True, text=True)
+        if process.returncode != 0:
+            return None
+
+        for line in reversed(process.stderr.splitlines()):
+            match = IMPORTTIME_RE.match(line)
+            if match and match.group(2) == module:
+                timings.append(int(match.group(1)) / 1000)
+                break
+
+    return min(timings) if timings else None
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description="Measure the import time of every module against its budget")
+    argparser.add_argument("--runs", type=int, default=5,
+                           help="imports per module, the fastest counts (default: 5)")
+    argparser.add_argument("--json", help="write the results to this json file")
+    args = argparser.parse_args()
+
+    results = {}
+    exceeded = False
+
+    print(f"{'module':<14} {'ms':>8} {'budget':>8}  status")
+    for module, budget in BUDGETS.items():
+        milliseconds = measure(module, args.runs)
+
+        if milliseconds is None:
+            status = "skipped (cannot be imported here)"
+        elif milliseconds > budget:
+            status = "OVER BUDGET"
+            exceeded = True
+        else:
+            status = "ok"
+
+        results[module] = {"ms": milliseconds, "budget": budget, "status": status}
+        shown = "-" if milliseconds is None else f"{milliseconds:.1f}"
+        print(f"{module:<14} {shown:>8} {budget:>8}  {status}")
+
+    if args.json:
+        with open(args.json, "w") as jsonfile:
+            json.dump(results, jsonfile, indent=4)
+
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
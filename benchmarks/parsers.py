@@ -0,0 +1,78 @@
+"""
+# Parser Benchmark
+Compares the image page parser backends of `ImgPile` on saved image pages.
+
+### Usage
+> `python benchmarks/parsers.py page1.html page2.html ... [--rounds 20]`
+
+Save a few image pages from imgpile.com (`Ctrl+S` in the browser) and pass
+their paths. Every backend parses every page `rounds` times, the output is
+checked against the `html.parser` backend (the reference).
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+# Modules of this project live in the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from imgpile import ImgPile  # noqa: E402
+
+
+def benchmark(pages: list, rounds: int):
+    """
+    ### Benchmark
+    Parses `pages` `rounds` times with every backend and returns a list of
+    `(parser, tree_builder, seconds_per_page, mismatches)` rows.
+    """
+    reference = ImgPile(parser="html.parser")
+    expected = [reference.parse_image_data(page) for page in pages]
+
+    rows = []
+    for parser in ImgPile.PARSERS:
+        api = ImgPile(parser=parser)
+
+        # Output must match the reference parser
+        mismatches = sum(api.parse_image_data(page) != data
+                         for page, data in zip(pages, expected))
+
+        start = perf_counter()
+        for _ in range(rounds):
+            for page in pages:
+                api.parse_image_data(page)
+        seconds = (perf_counter() - start) / (rounds * len(pages))
+
+        rows.append((parser, api.tree_builder, seconds, mismatches))
+
+    return rows
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description="Compare ImgPile's image page parsers on saved pages")
+    argparser.add_argument("pages", nargs="+", help="saved image pages (html)")
+    argparser.add_argument("--rounds", type=int, default=20,
+                           help="times every page is parsed (default: 20)")
+    args = argparser.parse_args()
+
+    pages = []
+    for filepath in args.pages:
+        with open(filepath, encoding="utf-8") as page:
+            pages.append(page.read())
+
+    rows = benchmark(pages, args.rounds)
+    baseline = rows[-1][2]
+
+    print(f"{'parser':<12} {'builder':<12} {'ms/page':>9} {'speedup':>8} {'mismatches':>10}")
+    for parser, builder, seconds, mismatches in rows:
+        print(f"{parser:<12} {builder:<12} {seconds * 1000:>9.3f} "
+              f"{baseline / seconds:>7.1f}x {mismatches:>10}")
+
+    # Non-zero exit code if a backend disagrees with the reference
+    return 1 if any(row[3] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+"""
+# Replay Server
+A local stand-in for imgpile.com to measure the scraper & downloader offline.
+
+It serves a synthetic album (listing pages paginated with `li.pagination-next`,
+image pages & image payloads) or, with `record_dir`, pages recorded from the
+real website. Latency, bandwidth and errors can be injected.
+
+### Usage
+> `python benchmarks/replay_server.py --images 1000 --latency 0.05 --error-rate 0.01`
+
+Then scrape `http://127.0.0.1:8765/album/1`.
+
+```
+/album/<page>      listing page <page> of the album
+/i/<id>            image page of image <id>
+/img/<id>.jpg      full quality image  (`image_size` bytes)
+/img/<id>.md.jpg   low quality image   (`image_size` / 4 bytes)
+/img/<id>.th.jpg   thumbnail           (`thumb_size` bytes)
+```
+
+Images have an `ETag` & `Last-Modified` and honor `Range: bytes=N-` (with
+`If-Range`), like a CDN does. Pages have an `ETag` too and answer
+`If-None-Match` with `304 Not Modified`.
+"""
+
+import argparse
+import os
+import random
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from time import sleep
+from email.utils import formatdate
+
+LISTING_PAGE = """<!DOCTYPE html>
+<html><head><title>Album</title></head><body>
+<div id="content-listing-tabs">
+{images}
+</div>
+<ul class="content-listing-pagination visible">
+<li class="pagination-prev"><a href="{prev_page}">Prev</a></li>
+{next_page}
+</ul>
+</body></html>
+"""
+
+LISTING_IMAGE = '<div class="list-item"><a class="image-container" href="{link}"><img src="{thumb}"></a></div>'
+
+NEXT_PAGE = '<li class="pagination-next"><a href="{link}">Next</a></li>'
+
+IMAGE_PAGE = """<!DOCTYPE html>
+<html><head><title>Image {id}</title></head><body>
+<div class="content-width">
+<div class="header">
+<div class="header-content-left"><span class="breadcrum-text float-left">
+uploader{uploader}
+</span></div>
+<div class="header-content-right">
+{views} views
+{likes}
+</div>
+</div>
+<h1 class="viewer-title">Image {id}</h1>
+<a class="btn btn-download default" href="{base}/img/{id}.jpg" title="{width} x {height} - JPG {size}">Download</a>
+<div class="panel-share">
+<div class="panel-share-item">
+<div class="panel-share-input-label copy-hover-display"><input type="text" value="{base}/img/{id}.jpg"></div>
+<div class="panel-share-input-label copy-hover-display"><input type="text" value="{base}/i/{id}"></div>
+<div class="panel-share-input-label copy-hover-display"><input type="text" value="{base}/img/{id}.th.jpg"></div>
+<div class="panel-share-input-label copy-hover-display"><input type="text" value="{base}/img/{id}.md.jpg"></div>
+</div>
+<div class="panel-share-item"><input type="text" value="embed codes"></div>
+</div>
+<p class="description-meta margin-bottom-5">Uploaded <span>{uploaded} days ago</span></p>
+</div>
+</body></html>
+"""
+
+
+class ReplayServer:
+    """
+    ### Replay Server
+    Serves a synthetic album of `images` images (`per_page` per listing page).
+
+    ```
+    latency     = seconds waited before every response
+    bandwidth   = bytes per second of every response body (`None` = unlimited)
+    error_rate  = share of requests answered with `503 Service Unavailable`
+    record_dir  = directory of recorded pages, served by path instead
+    ```
+    """
+
+    def __init__(self, images: int = 100, per_page: int = 42, host: str = "127.0.0.1",
+                 port: int = 0, latency: float = 0.0, bandwidth: int = None,
+                 error_rate: float = 0.0, image_size: int = 64 * 1024,
+                 thumb_size: int = 4 * 1024, record_dir: str = None, seed: int = 0):
+        self.images = images
+        self.per_page = per_page
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.image_size = image_size
+        self.thumb_size = thumb_size
+        self.record_dir = record_dir
+
+        self._random = random.Random(seed)
+        self._random_lock = Lock()
+        # Served requests & bytes
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base(self):
+        """Base url of the server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def album_url(self):
+        """Url of the first listing page of the album"""
+        return f"{self.base}/album/1"
+
+    @property
+    def pages(self):
+        """Number of listing pages of the album"""
+        return max(1, -(-self.images // self.per_page))
+
+    def start(self):
+        """Starts serving in a background thread, returns `self`"""
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_):
+        self.stop()
+
+    # * Responses
+    def respond(self, path: str):
+        """
+        ### Respond
+        Returns `(status, content type, body)` of the request of `path`.
+        """
+        if self.record_dir:
+            return self._recorded(path)
+
+        parts = path.strip("/").split("/")
+        try:
+            if parts[0] == "album":
+                return 200, "text/html; charset=utf-8", self.listing_page(int(parts[1]))
+            if parts[0] == "i":
+                return 200, "text/html; charset=utf-8", self.image_page(int(parts[1]))
+            if parts[0] == "img":
+                return 200, "image/jpeg", self.image_payload(parts[1])
+        except (IndexError, ValueError):
+            pass
+        return 404, "text/plain", b"Not Found"
+
+    def listing_page(self, page: int):
+        """Returns listing page `page` of the album"""
+        if not 1 <= page <= self.pages:
+            raise ValueError(page)
+
+        first = (page - 1) * self.per_page
+        images = "\n".join(LISTING_IMAGE.format(link=f"{self.base}/i/{id_}",
+                                                thumb=f"{self.base}/img/{id_}.th.jpg")
+                           for id_ in range(first, min(self.images, first + self.per_page)))
+        next_page = NEXT_PAGE.format(link=f"{self.base}/album/{page + 1}") \
+            if page < self.pages else ""
+
+        return LISTING_PAGE.format(images=images, next_page=next_page,
+                                   prev_page=f"{self.base}/album/{max(1, page - 1)}").encode()
+
+    def image_page(self, id_: int):
+        """Returns the image page of image `id_`"""
+        if not 0 <= id_ < self.images:
+            raise ValueError(id_)
+
+        size_mb = self.image_size / 1024 ** 2
+        return IMAGE_PAGE.format(base=self.base, id=id_, uploader=id_ % 7,
+                                 views=id_ * 3, likes=id_ % 11, width=1920, height=1080,
+                                 size=f"{size_mb:.2f} MB", uploaded=id_ % 30 + 1).encode()
+
+    def image_payload(self, name: str):
+        """Returns the (deterministic) bytes of image file `name`"""
+        id_ = int(name.split(".")[0])
+        if not 0 <= id_ < self.images:
+            raise ValueError(id_)
+
+        if name.endswith(".th.jpg"):
+            size = self.thumb_size
+        elif name.endswith(".md.jpg"):
+            size = self.image_size // 4
+        else:
+            size = self.image_size
+
+        pattern = id_.to_bytes(4, "big") * 256
+        return (pattern * (size // len(pattern) + 1))[:size]
+
+    def _recorded(self, path: str):
+        """Serves the recorded file of `path` from `self.record_dir`"""
+        filepath = os.path.normpath(os.path.join(self.record_dir, path.strip("/")))
+        if not filepath.startswith(os.path.abspath(self.record_dir)) and \
+                not filepath.startswith(os.path.normpath(self.record_dir)):
+            return 404, "text/plain", b"Not Found"
+
+        if os.path.isdir(filepath):
+            filepath = os.path.join(filepath, "index.html")
+        if not os.path.isfile(filepath):
+            return 404, "text/plain", b"Not Found"
+
+        with open(filepath, "rb") as recorded:
+            body = recorded.read()
+        content_type = "text/html; charset=utf-8" if body.lstrip()[:1] == b"<" else "image/jpeg"
+        return 200, content_type, body
+
+    def _inject_error(self):
+        """Returns `True` if this request should fail"""
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def _handler(self):
+        """Returns the request handler class bound to this server"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers & body are separate writes, Nagle would stall every response ~40ms
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._serve()
+
+            def do_HEAD(self):
+                self._serve(send_body=False)
+
+            def _serve(self, send_body: bool = True):
+                """Answers the request, with its body only if `send_body`"""
+                server.requests += 1
+                if server.latency:
+                    sleep(server.latency)
+
+                if server._inject_error():
+                    server.errors += 1
+                    status, content_type, body = 503, "text/plain", b"Service Unavailable"
+                else:
+                    status, content_type, body = server.respond(self.path)
+
+                headers = {}
+                if status == 200 and content_type == "image/jpeg":
+                    status, body, headers = self._ranged(body)
+                elif status == 200:
+                    status, body, headers = self._conditional(body)
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status == 503:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                if not send_body:
+                    return
+                try:
+                    self._write(body)
+                except ConnectionError:
+                    # Client gave up (e.g. cancelled download)
+                    self.close_connection = True
+
+            def _ranged(self, body: bytes):
+                """Returns `(status, body, headers)` honoring `Range` & `If-Range`"""
+                etag = f'"{len(body)}-{hash(body[:64])}"'
+                headers = {"Accept-Ranges": "bytes", "ETag": etag,
+                           "Last-Modified": formatdate(0, usegmt=True)}
+
+                range_ = self.headers.get("Range", "")
+                if_range = self.headers.get("If-Range")
+                if not range_.startswith("bytes=") or (if_range and if_range != etag):
+                    return 200, body, headers
+
+                start = range_[6:].split("-")[0]
+                if not start.isdigit() or int(start) >= len(body):
+                    headers['Content-Range'] = f"bytes */{len(body)}"
+                    return 416, b"", headers
+
+                start = int(start)
+                headers['Content-Range'] = f"bytes {start}-{len(body) - 1}/{len(body)}"
+                return 206, body[start:], headers
+
+            def _conditional(self, body: bytes):
+                """Returns `(status, body, headers)` honoring `If-None-Match`"""
+                etag = f'"{zlib.crc32(body):08x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    return 304, b"", {"ETag": etag}
+                return 200, body, {"ETag": etag}
+
+            def _write(self, body: bytes):
+                """Writes `body`, throttled to `server.bandwidth`"""
+                if not server.bandwidth:
+                    self.wfile.write(body)
+                else:
+                    chunk_size = max(1024, server.bandwidth // 20)
+                    for start in range(0, len(body), chunk_size):
+                        chunk = body[start:start + chunk_size]
+                        self.wfile.write(chunk)
+                        sleep(len(chunk) / server.bandwidth)
+                server.bytes_sent += len(body)
+
+            def log_message(self, *_):
+                # Keep the benchmark output clean
+                pass
+
+        return Handler
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="Serve a synthetic imgpile album")
+    argparser.add_argument("--images", type=int, default=100)
+    argparser.add_argument("--per-page", type=int, default=42)
+    argparser.add_argument("--port", type=int, default=8765)
+    argparser.add_argument("--latency", type=float, default=0.0,
+                           help="seconds before every response")
+    argparser.add_argument("--bandwidth", type=int, default=None,
+                           help="bytes per second of every response")
+    argparser.add_argument("--error-rate", type=float, default=0.0,
+                           help="share of requests failing with 503")
+    argparser.add_argument("--image-size", type=int, default=64 * 1024)
+    argparser.add_argument("--record-dir", help="serve recorded pages from here")
+    args = argparser.parse_args()
+
+    server = ReplayServer(images=args.images, per_page=args.per_page, port=args.port,
+                          latency=args.latency, bandwidth=args.bandwidth,
+                          error_rate=args.error_rate, image_size=args.image_size,
+                          record_dir=args.record_dir)
+    print(f"Serving {server.album_url} (Ctrl+C to stop)")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+# Scraper Benchmark
+Measures the scraper & the downloaders end to end against the local replay
+server (`benchmarks/replay_server.py`), no request reaches imgpile.com.
+
+### Usage
+> `python benchmarks/scraper.py [--sizes 100 1000 10000] [--latency 0.02] [--compare results/old.json]`
+
+For every album size it times:
+```
+scrape       ImgPile.get (listing & image pages)     pages/s, images/s
+download     Backend.download_images (every image)   images/s, MB/s
+thumbnails   thumbnail loading like the GUI does     images/s, MB/s
+```
+
+Results are saved as json in `benchmarks/results/` (one file per run), pass an
+older file to `--compare` to print the change of every number.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from threading import Event
+from time import perf_counter
+
+# Modules of this project live in the parent directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend import Backend  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def bench_scrape(server: ReplayServer, args):
+    """Times `ImgPile.get` over the whole album, returns `(images, result)`"""
+    backend = Backend(engine=args.engine, max_workers=args.workers,
+                      per_host_limit=args.workers, cache_dir=None, journal_dir=None)
+    requests_before = server.requests
+
+    start = perf_counter()
+    images = backend.get_response(server.album_url, Event(), resume=False)
+    seconds = perf_counter() - start
+
+    pages = server.requests - requests_before
+    return images, {
+        "seconds": seconds,
+        "images": len(images),
+        "pages": pages,
+        "pages_per_second": pages / seconds,
+        "images_per_second": len(images) / seconds,
+        "failed": len(backend.get_api().failed_links),
+    }
+
+
+def bench_download(server: ReplayServer, images: list, save_path: str, args):
+    """Times `Backend.download_images` (`Backend.download_image` for every image)"""
+    backend = Backend(cache_dir=None, journal_dir=None, per_host_limit=args.workers,
+                      download_workers=args.workers)
+    bytes_before = server.bytes_sent
+
+    start = perf_counter()
+    backend.download_images(images, "High Quality", save_path, Event())
+    seconds = perf_counter() - start
+
+    return rates(len(images), server.bytes_sent - bytes_before, seconds)
+
+
+def bench_thumbnails(server: ReplayServer, images: list):
+    """Times thumbnail loading as `ImageItemFrame.load_thumbnail` does it"""
+    backend = Backend(cache_dir=None, journal_dir=None)
+    total_bytes = 0
+
+    start = perf_counter()
+    for image in images:
+        total_bytes += len(backend.session.get(image['thumb_url'],
+                                               timeout=backend.timeout).content)
+    seconds = perf_counter() - start
+
+    return rates(len(images), total_bytes, seconds)
+
+
+def rates(images: int, total_bytes: int, seconds: float):
+    """Returns the throughput of a download run"""
+    return {
+        "seconds": seconds,
+        "images": images,
+        "bytes": total_bytes,
+        "images_per_second": images / seconds if seconds else 0.0,
+        "mb_per_second": total_bytes / 1024 ** 2 / seconds if seconds else 0.0,
+    }
+
+
+def run(args):
+    """Runs the benchmark for every album size, returns the results"""
+    results = {}
+    for size in args.sizes:
+        with ReplayServer(images=size, latency=args.latency, bandwidth=args.bandwidth,
+                          error_rate=args.error_rate, image_size=args.image_size) as server:
+            images, scrape = bench_scrape(server, args)
+            print(f"{size:>6} images | scrape     {scrape['seconds']:8.2f}s "
+                  f"{scrape['pages_per_second']:9.1f} pages/s "
+                  f"{scrape['images_per_second']:9.1f} images/s")
+
+            save_path = tempfile.mkdtemp(prefix="imgcrawler-bench-")
+            try:
+                download = bench_download(server, images, save_path, args)
+            finally:
+                shutil.rmtree(save_path, ignore_errors=True)
+            print(f"{'':>6}        | download   {download['seconds']:8.2f}s "
+                  f"{download['images_per_second']:9.1f} images/s "
+                  f"{download['mb_per_second']:9.1f} MB/s")
+
+            thumbnails = bench_thumbnails(server, images)
+            print(f"{'':>6}        | thumbnails {thumbnails['seconds']:8.2f}s "
+                  f"{thumbnails['images_per_second']:9.1f} images/s "
+                  f"{thumbnails['mb_per_second']:9.1f} MB/s")
+
+        results[str(size)] = {"scrape": scrape, "download": download,
+                              "thumbnails": thumbnails}
+    return results
+
+
+def compare(results: dict, filepath: str):
+    """Prints the change of every rate against the results in `filepath`"""
+    with open(filepath) as jsonfile:
+        previous = json.load(jsonfile)['results']
+
+    print(f"\nCompared to {filepath}:")
+    for size, benches in results.items():
+        for bench, numbers in benches.items():
+            old = previous.get(size, {}).get(bench)
+            if not old:
+                continue
+            for key, value in numbers.items():
+                if not key.endswith("_per_second") or not old.get(key):
+                    continue
+                change = (value - old[key]) / old[key] * 100
+                print(f"{size:>6} images | {bench:<10} {key:<18} "
+                      f"{old[key]:9.1f} > {value:9.1f} ({change:+.1f}%)")
+
+
+def save(results: dict, args):
+    """Saves `results` (& the run's settings) in `RESULTS_DIR`, returns the path"""
+    if not os.path.isdir(RESULTS_DIR):
+        os.makedirs(RESULTS_DIR)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    filepath = os.path.join(RESULTS_DIR, f"scraper-{timestamp}.json")
+    with open(filepath, "w") as jsonfile:
+        json.dump({
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "settings": {key: value for key, value in vars(args).items()
+                         if key != "compare"},
+            "results": results,
+        }, jsonfile, indent=4)
+    return filepath
+
+
+def main():
+    argparser = argparse.ArgumentParser(
+        description="Benchmark the scraper & downloaders against a local replay server")
+    argparser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                           help="album sizes in images (default: 100 1000 10000)")
+    argparser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                           help="scraping engine (default: sync)")
+    argparser.add_argument("--workers", type=int, default=8,
+                           help="image pages scraped & images downloaded at once (default: 8)")
+    argparser.add_argument("--latency", type=float, default=0.0,
+                           help="seconds before every response (default: 0)")
+    argparser.add_argument("--bandwidth", type=int, default=None,
+                           help="bytes per second of every response (default: unlimited)")
+    argparser.add_argument("--error-rate", type=float, default=0.0,
+                           help="share of requests failing with 503 (default: 0)")
+    argparser.add_argument("--image-size", type=int, default=64 * 1024,
+                           help="bytes of every full quality image (default: 65536)")
+    argparser.add_argument("--compare", metavar="JSON",
+                           help="earlier results to compare this run with")
+    args = argparser.parse_args()
+
+    results = run(args)
+    print(f"\nSaved to {save(results, args)}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Prompt cancellation of in-flight requests
+
+Setting a cancel `Event` only stops work *between* requests. To stop a request
+that is blocked waiting for headers or in the middle of a large body, the
+sockets of the requests sent within a `cancel_scope(event)` are shut down as
+soon as `event` is set: the blocked read fails right away, the connection is
+dropped (not returned to the pool) and the scope raises `RequestCancelled`.
+
+```
+with cancel_scope(event):
+    response = session.get(url, stream=True)
+    content = response.content
+```
+
+Sockets are only known once connected, so a request still connecting is
+bounded by its connect timeout.
+
+The connections also time their `connect()` (DNS lookup, TCP & TLS handshake),
+`connect_time()` returns the seconds the current thread spent connecting.
+"""
+
+import socket
+from threading import Lock, Thread, local
+from time import perf_counter, sleep
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from ratelimit import RequestCancelled
+
+# Scope & connect time of the requests sent by the current thread
+_local = local()
+
+
+class CancelScope:
+    """
+    ### Cancel Scope
+    Shuts the sockets of the requests sent (by this thread) within the scope
+    down as soon as `event` is set. Any error raised within a cancelled scope
+    becomes `RequestCancelled`.
+    """
+
+    def __init__(self, event, watcher):
+        self.event = event
+        self.watcher = watcher
+        self.cancelled = False
+        self._sockets = set()
+        self._lock = Lock()
+
+    def add(self, sock):
+        """Registers `sock` (shut down right away if already cancelled)"""
+        with self._lock:
+            self._sockets.add(sock)
+        if self.event.is_set():
+            self.cancel()
+
+    def cancel(self):
+        """Shuts every registered socket down, blocked reads fail at once"""
+        with self._lock:
+            self.cancelled = True
+            sockets, self._sockets = self._sockets, set()
+
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                # Already closed
+                pass
+
+    def __enter__(self):
+        self._outer = getattr(_local, "scope", None)
+        _local.scope = self
+        self.watcher.watch(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        _local.scope = self._outer
+        self.watcher.unwatch(self)
+        with self._lock:
+            self._sockets.clear()
+
+        if exc_type is not None and self.event.is_set() and \
+                not issubclass(exc_type, RequestCancelled):
+            raise RequestCancelled(str(exc)) from exc
+        return False
+
+
+class _NullScope:
+    """Scope of a request that cannot be cancelled (no event)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+class CancelWatcher:
+    """
+    ### Cancel Watcher
+    A single daemon thread polling the events of the open scopes every
+    `poll_interval` seconds and cancelling the scopes whose event is set.
+    """
+
+    def __init__(self, poll_interval: float = 0.05):
+        self.poll_interval = poll_interval
+        self._scopes = set()
+        self._lock = Lock()
+        self._thread = None
+
+    def watch(self, scope: CancelScope):
+        """Starts watching `scope` (starts the thread on first use)"""
+        with self._lock:
+            self._scopes.add(scope)
+            if self._thread is None:
+                self._thread = Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def unwatch(self, scope: CancelScope):
+        """Stops watching `scope`"""
+        with self._lock:
+            self._scopes.discard(scope)
+
+    def _run(self):
+        while True:
+            sleep(self.poll_interval)
+            with self._lock:
+                cancelled = [scope for scope in self._scopes
+                             if scope.event.is_set() and not scope.cancelled]
+            for scope in cancelled:
+                scope.cancel()
+
+
+# Shared by every scope
+_watcher = CancelWatcher()
+
+
+def cancel_scope(event):
+    """
+    ### Cancel Scope
+    Returns a context manager whose requests are aborted as soon as `event`
+    is set (does nothing if `event` is `None`).
+    """
+    if event is None:
+        return _NullScope()
+    return CancelScope(event, _watcher)
+
+
+def _register_socket(sock):
+    """Registers `sock` with the current thread's scope (if any)"""
+    scope = getattr(_local, "scope", None)
+    if scope is not None and sock is not None:
+        scope.add(sock)
+
+
+def connect_time():
+    """
+    ### Connect Time
+    Returns the seconds the current thread spent opening connections since
+    the last call (`0.0` if every request reused a pooled connection).
+    """
+    seconds = getattr(_local, "connect_time", 0.0)
+    _local.connect_time = 0.0
+    return seconds
+
+
+def _add_connect_time(seconds: float):
+    """Adds `seconds` to the connect time of the current thread"""
+    _local.connect_time = getattr(_local, "connect_time", 0.0) + seconds
+
+
+class _CancellableHTTPConnection(HTTPConnection):
+    def connect(self):
+        # Only timed when it succeeds, a failed connect raises anyway
+        started = perf_counter()
+        super().connect()
+        _add_connect_time(perf_counter() - started)
+
+    def getresponse(self, *args, **kwargs):
+        # Waiting for the headers (& later the body) can be aborted from now on
+        _register_socket(self.sock)
+        return super().getresponse(*args, **kwargs)
+
+
+class _CancellableHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = perf_counter()
+        super().connect()
+        _add_connect_time(perf_counter() - started)
+
+    def getresponse(self, *args, **kwargs):
+        _register_socket(self.sock)
+        return super().getresponse(*args, **kwargs)
+
+
+class _CancellableHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CancellableHTTPConnection
+
+
+class _CancellableHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CancellableHTTPSConnection
+
+
+class CancellableAdapter(HTTPAdapter):
+    """
+    ### Cancellable Adapter
+    `HTTPAdapter` whose connections register their socket with the current
+    `cancel_scope`, so requests sent within a scope can be aborted, and time
+    their connect (see `connect_time`).
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CancellableHTTPConnectionPool,
+            "https": _CancellableHTTPSConnectionPool,
+        }
@@ -0,0 +1,83 @@
+"""
+Unique filenames for images saved into a folder
+
+Albums often hold many images with the same title. Instead of probing the disk
+for `name.ext`, `name 0.ext`, `name 1.ext`... one name at a time, the folder is
+scanned once and the used names are kept in memory: every base name remembers
+the next number to try, so a free name is handed out in (amortized) O(1).
+
+```
+allocator = FilenameAllocator(save_path)
+allocator.allocate("Image.jpg")     # 'Image.jpg'
+allocator.allocate("Image.jpg")     # 'Image 0.jpg'
+```
+"""
+
+import os
+from os import path
+from threading import Lock
+
+
+class FilenameAllocator:
+    """
+    ### Filename Allocator
+    Hands out unique filenames in `directory` (thread-safe). The directory is
+    scanned once, `taken` names (e.g. reserved but not on disk yet) count as
+    used too.
+
+    Names are compared like the file system does (case-insensitively on
+    Windows).
+    """
+
+    def __init__(self, directory: str, taken=()):
+        self.directory = directory
+
+        self._lock = Lock()
+        # Names on disk when scanned
+        self._on_disk = set()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    self._on_disk.add(path.normcase(entry.name))
+        except FileNotFoundError:
+            pass
+
+        # Names taken (reserved or handed out), on disk or not
+        self._taken = set(path.normcase(name) for name in taken if name)
+        # Base name > next number to try
+        self._next = {}
+
+    def on_disk(self, filename: str):
+        """Returns whether `filename` was in the directory when scanned"""
+        return path.normcase(filename) in self._on_disk
+
+    def allocate(self, filename: str, adopt: bool = False):
+        """
+        ### Allocate
+        Returns `filename` if it is free, otherwise the first free
+        `"filename {i}.ext"`, and marks it as taken.
+
+        With `adopt`, a `filename` on disk that isn't taken is handed out as
+        is (its file is meant to be reused).
+        """
+        key = path.normcase(filename)
+        with self._lock:
+            if key not in self._taken and (adopt or key not in self._on_disk):
+                self._taken.add(key)
+                return filename
+
+            name, ext = path.splitext(filename)
+            base = path.normcase(name), path.normcase(ext)
+            # * Numbers below `i` are known to be used, never try them again
+            i = self._next.get(base, 0)
+            while self._used(f"{name} {i}{ext}"):
+                i += 1
+            self._next[base] = i + 1
+
+            filename = f"{name} {i}{ext}"
+            self._taken.add(path.normcase(filename))
+            return filename
+
+    def _used(self, filename: str):
+        key = path.normcase(filename)
+        return key in self._taken or key in self._on_disk
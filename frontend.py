@@ -8,21 +8,45 @@ from backend import Backend
 import os
 from os.path import normpath
 from threading import Thread, Event
-import requests
+from queue import Queue, Empty
 from io import BytesIO
 from PIL import Image, ImageTk
-from time import sleep
-import pyperclip
+from time import sleep, monotonic
+
+
+# Icons opened so far (filename > PIL image)
+_icons = {}
+
+
+def load_icon(filename: str):
+    """ 
+    ### Load Icon
+    Opens the image `filename` of `assets` on first use and returns it
+    (from memory afterwards).
+    """
+    if filename not in _icons:
+        _icons[filename] = Image.open(os.path.join("assets", filename))
+    return _icons[filename]
 
 
 class App(ctk.CTk):
     PROGRAM_NAME = "ImgCrawler"
     PROGRAM_VER = "1.0"
+    # Scraped images are sent to the GUI in batches of this size (or after
+    # this many seconds, whichever comes first)
+    STREAM_BATCH_SIZE = 20
+    STREAM_BATCH_INTERVAL = 0.5
 
     def __init__(self):
         super().__init__(fg_color="#1F1F1F")
         self.backend = Backend()
 
+        # * Persistent download queue, jobs left unfinished continue now
+        self.download_queue = self.backend.open_download_queue()
+        self.download_queue.add_listener(self.on_download_job)
+        # Job of the download dialog (progress is shown there)
+        self.download_job_id = None
+
         # * Colors & Fonts
         self.font_ = "Segoe UI"
 
@@ -148,8 +172,8 @@ class App(ctk.CTk):
         self.view_frame.columnconfigure(0, weight=1)
 
         # No Images Label+Image Widget
-        self.no_images_image = ctk.CTkImage(dark_image=Image.open(
-            "assets\\no_image_dark.png"), size=(32, 32))
+        self.no_images_image = ctk.CTkImage(dark_image=load_icon(
+            "no_image_dark.png"), size=(32, 32))
         ctk.CTkLabel(self.view_frame, font=("Segoe UI Semibold", 25),
                      text="No images to show", text_color="#404040",
                      image=self.no_images_image, compound="left").grid()
@@ -177,6 +201,24 @@ class App(ctk.CTk):
                    follow=False, delay=0.5,
                    message="Download the scraped data",)
 
+        self.button_downloads = ctk.CTkButton(self.other_frame,
+                                              text="Downloads",
+                                              width=95, height=35,
+                                              corner_radius=4,
+                                              font=(
+                                                  f"{self.font_} bold", 16),
+                                              text_color="#c8c8c8",
+                                              border_width=1,
+                                              border_color="#404040",
+                                              hover_color="#046DB9",
+                                              fg_color="#353535",
+                                              command=self.show_downloads)
+        self.button_downloads.grid(row=0, column=1, sticky="e")
+        # Tooltip for button
+        CTkToolTip(self.button_downloads,
+                   follow=False, delay=0.5,
+                   message="Show the download queue (pause, resume or remove albums)",)
+
         self.other_frame.columnconfigure((0, ), weight=1)
 
         # ? Padding otherframe's childs
@@ -264,6 +306,8 @@ class App(ctk.CTk):
 
         # Scraping thread event
         self.scraping_event = Event()
+        # Scraped data is replaced when the first images arrive
+        self.streaming_started = False
 
         # Start scraping in new thread
         scraping_thread = Thread(target=self.scrape_in_background, args=(
@@ -274,11 +318,27 @@ class App(ctk.CTk):
         """
         ### Scrape in Background
         scrape the data in background (new thread)
+
+        Images are streamed into the GUI in batches while the album is
+        still being scraped.
         """
         try:
-            result = self.backend.get_response(url, event)
-            if result:
-                self.after(0, self.update_gui, result)
+            batch = []
+            last_flush = monotonic()
+            for image in self.backend.stream_response(url, event):
+                batch.append(image)
+
+                # Send the batch to the GUI when full (or has waited enough)
+                if len(batch) >= self.STREAM_BATCH_SIZE or monotonic() - last_flush >= self.STREAM_BATCH_INTERVAL:
+                    self.after(0, self.append_images, batch)
+                    batch = []
+                    last_flush = monotonic()
+
+            # Incase, User cancelled the operation
+            if event.is_set():
+                return
+
+            self.after(0, self.update_gui, batch)
         except Exception as e:
             # In-case of errors, call error handler
             self.after(0, self.handle_scrape_errors, e)
@@ -291,21 +351,40 @@ class App(ctk.CTk):
         self.button_scrape.configure(text="Scrape", state="normal")
         self.button_scrape_cancel.configure(state="disabled")
 
-    def update_gui(self, result=None):
-        """ Updates the GUI """
-        self.scrape_completed()
+    def append_images(self, batch):
+        """ 
+        ### Append Images
+        Appends a `batch` of freshly scraped images to the scraped data
+        and to the `view_frame`.
+        """
+        # Incase, User cancelled, drop the late batches
+        if self.scraping_event.is_set() or not batch:
+            return
 
-        # Save the response "class"ically :)
-        self.scraped_data = result
+        # First batch replaces the previously scraped data
+        if not self.streaming_started:
+            self.streaming_started = True
+            self.scraped_data = []
+
+        start = len(self.scraped_data)
+        self.scraped_data.extend(batch)
         self.update_properties()
 
-        # Show images in 'view_frame'
-        self.show_images()
+        # Show the new images in 'view_frame'
+        self.show_images(start=start, hide_progress_bar=False)
 
         # Update 'view_frame's title
         self.view_frame.configure(
             label_text=f"Total Images: {self.total_images} | Total Size: {self.total_size}")
 
+    def update_gui(self, batch=None):
+        """ Updates the GUI """
+        self.scrape_completed()
+
+        # Show the last batch of images
+        self.append_images(batch)
+        self.scrape_progress_bar.grid_forget()
+
         # Showing message
         messagebox.showinfo("Scraping Complete",
                             "Target URL has been scraped successfully.")
@@ -367,37 +446,67 @@ class App(ctk.CTk):
         messagebox.showinfo("Thumbnails Downloaded",
                             "Thumbnails have been downloaded successfully.")
 
-    def show_images(self):
-        """ Start Image Displayer Thread """
-        # Create a image event, to stop thread at will... :)
-        self.show_image_event = Event()
-        display_thread = Thread(
-            target=self.show_images_in_background, args=(self.show_image_event, ))
-        display_thread.start()
-
-    def show_images_in_background(self, event: Event):
-        """ Displays images in `view_frame` in background """
-        # Clear the existing images first (if any)
-        childs = self.view_frame.winfo_children()[::-1]
-        if childs:
-            for child in childs:
-                child.grid_forget()
-                self.view_frame.after(5, child.destroy)
-
-        # Create new childs (spawn images)
-        for index, image in enumerate(self.scraped_data):
-            # If event is set, stop immediately!
-            if event.is_set():
-                break
-            ImageItemFrame(self.view_frame,
-                           title=image['title'],
-                           thumb_url=image['thumb_url'],
-                           image_type=image['image_type'], size=image['size'],
-                           dimensions=image['resolution'], uploaded=image['uploaded'],
-                           uploader=image['uploader'], views=image['views'],
-                           likes=image['likes'],).grid(row=index, padx=10, pady=3, sticky="ew")
-        # disable progressbar
-        self.scrape_progress_bar.grid_forget()
+    def show_images(self, start=0, hide_progress_bar=True):
+        """ 
+        Queue Images for the Image Displayer Thread
+
+        if `start` is `0`, the view is cleared first, otherwise only the
+        images from `start` onwards are appended.
+
+        A single displayer thread builds the rows of a view, streamed batches
+        wait in its queue instead of building rows next to each other.
+        """
+        if start == 0 or not hasattr(self, "show_image_event"):
+            # A new view, stop the displayer of the previous one
+            if hasattr(self, "show_image_event"):
+                self.show_image_event.set()
+            # Create a image event, to stop thread at will... :)
+            self.show_image_event = Event()
+            self.show_image_queue = Queue()
+            display_thread = Thread(
+                target=self.show_images_in_background,
+                args=(self.show_image_event, self.show_image_queue),
+                daemon=True)
+            display_thread.start()
+
+        self.show_image_queue.put(
+            (start, self.scraped_data[start:], hide_progress_bar))
+
+    def show_images_in_background(self, event: Event, batches: Queue):
+        """
+        Displays the batches of `batches` (`(start row, images, hide progress bar)`)
+        in `view_frame` one after another in background, until `event` is set
+        """
+        while not event.is_set():
+            try:
+                start, images, hide_progress_bar = batches.get(timeout=0.5)
+            except Empty:
+                continue
+
+            if start == 0:
+                # Clear the existing images first (if any)
+                childs = self.view_frame.winfo_children()[::-1]
+                if childs:
+                    for child in childs:
+                        child.grid_forget()
+                        self.view_frame.after(5, child.destroy)
+
+            # Create new childs (spawn images)
+            for index, image in enumerate(images, start):
+                # If event is set, stop immediately!
+                if event.is_set():
+                    return
+                ImageItemFrame(self.view_frame,
+                               title=image['title'],
+                               thumb_url=image['thumb_url'],
+                               image_type=image['image_type'], size=image['size'],
+                               dimensions=image['resolution'], uploaded=image['uploaded'],
+                               uploader=image['uploader'], views=image['views'],
+                               likes=image['likes'],
+                               session=self.backend.session).grid(row=index, padx=10, pady=3, sticky="ew")
+            # disable progressbar
+            if hide_progress_bar:
+                self.scrape_progress_bar.grid_forget()
 
     def cancel_scraping(self):
         """ 
@@ -433,14 +542,16 @@ class App(ctk.CTk):
         self.download_dialog = DownloadDialog(self,
                                               self.image_downloader,
                                               self.text_downloader,
-                                              icon=self.iconpath)
+                                              icon=self.iconpath,
+                                              cancel_callback=self.cancel_image_download)
         # Give the focus to download dialog
         self.download_dialog.get_focus_force(200)
 
     def image_downloader(self, save_path, image_quality,  step_callback, event: Event):
         """
         ### Image Downloader
-        Begin image downloading process/thread.
+        Adds the scraped images to the download queue, the download dialog
+        shows the job's progress (see `on_download_job`).
 
         ```
         save_path = path to save images
@@ -448,45 +559,73 @@ class App(ctk.CTk):
         step_callback = called everytime an image is downloaded
         ```
         """
-        self.image_download_thread = Thread(target=self.download_images,
-                                            args=(save_path,
-                                                  image_quality,
-                                                  step_callback,
-                                                  event))
-        self.image_download_thread.start()
-
-    def download_images(self, save_path, image_quality, step_callback, event: Event):
-        """
-        ### Begin Download
-        Start the downloading process in a new thread
-        """
         try:
             # Reset the progress bar (if downloading again!)
             self.download_dialog.reset_progress_bar()
 
-            # Download imnages
-            for index, image in enumerate(self.scraped_data):
-                if image_quality == "High Quality":
-                    filename = self.backend.sanitize_string(
-                        image['title']) + image['extension']
-                    image_url = image['image_url']
-                else:
-                    filename = f"{self.backend.sanitize_string(image['title'])}_Lq_{image['extension']}"
-                    image_url = image['lq_url']
-
-                self.backend.download_image(image_url,
-                                            filename, save_path, event)
-                # Increase progress (progressbar)
-                step_callback(self.total_images, index+1)
-
-                if event.is_set():  # Incase user cancels downloading
-                    return
+            self.download_job_id = self.download_queue.add(
+                self.scraped_data, save_path, image_quality,
+                album=os.path.basename(normpath(save_path)))
+        except Exception as e:
+            self.after(0, self.handle_download_errors, e)
+
+    def on_download_job(self, event, job):
+        """
+        ### On Download Job
+        Called by the download queue (in a worker thread) on every change of
+        a job, the dialog's job is shown in the main loop.
+        """
+        if job['id'] == self.download_job_id and event != "added":
+            self.after(0, self.update_download_progress, event, job)
 
-            # Incase download is completed
+    def update_download_progress(self, event, job):
+        """
+        ### Update Download Progress
+        Shows the progress of the download dialog's `job`.
+        """
+        if job['id'] != self.download_job_id:
+            return
+
+        dialog = getattr(self, "download_dialog", None)
+        dialog_open = dialog is not None and dialog.winfo_exists()
+        if dialog_open and job['total']:
+            dialog.on_progress(job['total'], job['completed'])
+
+        if job['state'] == "done":
+            self.download_job_id = None
             self.download_completed()
+        elif job['state'] == "failed":
+            self.download_job_id = None
+            self.handle_download_errors(job['error'])
 
-        except Exception as e:
-            self.after(0, self.handle_download_errors, e)
+    def cancel_image_download(self):
+        """
+        ### Cancel Image Download
+        Removes the download dialog's job from the queue.
+        """
+        if self.download_job_id is None:
+            return
+
+        try:
+            self.download_queue.remove(self.download_job_id)
+        except KeyError:
+            # Already removed from the queue window
+            pass
+        self.download_job_id = None
+
+    def show_downloads(self):
+        """
+        ### Show Downloads
+        Shows the download queue window.
+        """
+        queue_dialog = getattr(self, "queue_dialog", None)
+        if queue_dialog is not None and queue_dialog.winfo_exists():
+            queue_dialog.get_focus_force(0)
+            return
+
+        self.queue_dialog = DownloadQueueDialog(self, self.download_queue,
+                                                icon=self.iconpath)
+        self.queue_dialog.get_focus_force(200)
 
     def download_completed(self):
         """
@@ -496,6 +635,8 @@ class App(ctk.CTk):
         # Show Download Complete Popup!
         messagebox.showinfo("Download Complete",
                             "Your Download has been completed.")
+        if not self.download_dialog.winfo_exists():
+            return
         self.after(0, self.download_dialog.hide_progress_bar)
         self.download_dialog._button_cancel.configure(state="disabled")
         self.download_dialog._button_download.configure(state="normal")
@@ -542,6 +683,9 @@ class App(ctk.CTk):
         ### Paste to Entry Url
         Paste the text copied to clipboard into entry on `Right-Mouse-Click`
         """
+        # Only needed here, imported on first paste
+        import pyperclip
+
         # Get text from clipboard & insert
         self.entry_url.delete(0, "end")
         self.entry_url.insert(0, pyperclip.paste())
@@ -563,10 +707,8 @@ class App(ctk.CTk):
         except AttributeError:
             pass
 
-        try:
-            self.download_dialog.image_downloading_event.set()
-        except AttributeError:
-            pass
+        # Unfinished downloads stay queued, they continue on next launch
+        self.download_queue.stop(timeout=1.0)
 
         # Wait for the main_thread to come into mainloop!
         self.update()
@@ -602,7 +744,7 @@ class DirectoryField(ctk.CTkFrame):
 
         # Open File Dialog Button
         self.image = ctk.CTkImage(
-            dark_image=Image.open("assets\\directory_light_16px.png"))
+            dark_image=load_icon("directory_light_16px.png"))
         self.dir_button = ctk.CTkButton(self, text="", image=self.image,
                                         width=30, height=30,
                                         fg_color="#404040",
@@ -665,7 +807,8 @@ class DownloadDialog(ctk.CTkToplevel):
     Download Popup Dialog custom widget for various downloading options & fields
     """
 
-    def __init__(self, master, image_downlod_callback, text_download_callback, icon, *args, **kwargs):
+    def __init__(self, master, image_downlod_callback, text_download_callback, icon,
+                 *args, cancel_callback=None, **kwargs):
         super().__init__(master, fg_color="#1f1f1f", *args, **kwargs)
 
         # * Colors & Fonts
@@ -681,6 +824,7 @@ class DownloadDialog(ctk.CTkToplevel):
         self.image_downloading_event = Event()  # Download event
         self.image_downloader = image_downlod_callback
         self.text_downloader = text_download_callback
+        self.cancel_callback = cancel_callback
 
         # Toplevel Configurations
         self.title("Download")
@@ -914,10 +1058,11 @@ class DownloadDialog(ctk.CTkToplevel):
         call this function at each download
         """
         # Calculate percentage
-        self.set_percentage_to(round((completed_tasks/total_tasks_)*100, 1))
+        percentage = round((completed_tasks/total_tasks_)*100, 1)
+        self.set_percentage_to(percentage)
 
-        # Increase the Progress
-        self._progress_bar['value'] += round((1/total_tasks_)*100, 5)
+        # Set the Progress
+        self._progress_bar['value'] = percentage
 
     def get_focus_force(self, after: int):
         """ 
@@ -934,6 +1079,8 @@ class DownloadDialog(ctk.CTkToplevel):
         """
         self._button_cancel.configure(state="disabled")
         self.image_downloading_event.set()
+        if self.cancel_callback is not None:
+            self.cancel_callback()
         self.after(0, self.hide_progress_bar)
         self._button_download.configure(state="normal")
         messagebox.showinfo("Download Cancelled",
@@ -943,14 +1090,193 @@ class DownloadDialog(ctk.CTkToplevel):
     def close_dialog(self):
         """
         ### Close Dialog
-        Close the dialog aka DESTROY!
+        Close the dialog aka DESTROY! (a running image download stays in the
+        download queue)
+        """
+        self.after(0, self.destroy)
+
+
+class DownloadQueueDialog(ctk.CTkToplevel):
+    """
+    ### Download Queue Dialog
+    Window listing the jobs of the download queue (state, progress &
+    throughput), each can be paused, resumed or removed.
+    """
+    # Milliseconds between refreshes
+    REFRESH_INTERVAL = 1000
+
+    def __init__(self, master, download_queue, icon, *args, **kwargs):
+        super().__init__(master, fg_color="#1f1f1f", *args, **kwargs)
+
+        # * Colors & Fonts
+        self.FONT = "Segoe UI"
+        self.TEXT_COLOR = "#bbbbbb"
+        self.FG_COLOR = "#292929"
+        self.BORDER_COLOR = "#404040"
+
+        self.download_queue = download_queue
+        self.backend = master.backend
+        # Widgets of every job's row (job id > dict of widgets)
+        self._rows = {}
+
+        # Toplevel Configurations
+        self.title("Downloads")
+        self.place_in_center(640, 360)
+        self.minsize(480, 200)
+        self.protocol("WM_DELETE_WINDOW", self.close_dialog)
+        # Icon
+        self.wm_iconbitmap()
+        self.after(200, lambda: self.iconphoto(False, icon))
+
+        # * Jobs Frame
+        self._jobs_frame = ctk.CTkScrollableFrame(self, fg_color=self.FG_COLOR,
+                                                  border_width=1,
+                                                  border_color=self.BORDER_COLOR,
+                                                  scrollbar_button_color="#353535",
+                                                  scrollbar_button_hover_color="#505050")
+        self._jobs_frame.grid(row=0, column=0, padx=5, pady=5, sticky="news")
+        self._jobs_frame.columnconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        self._empty_label = ctk.CTkLabel(self._jobs_frame, font=(f"{self.FONT} semibold", 16),
+                                         text="No downloads queued", text_color="#404040")
+
+        self.refresh()
+
+    def refresh(self):
         """
+        ### Refresh
+        Updates the rows from the queue's jobs (every `REFRESH_INTERVAL` ms).
+        """
+        if not self.winfo_exists():
+            return
+
+        jobs = self.download_queue.snapshot()
+
+        # Removed jobs
+        for job_id in set(self._rows) - {job['id'] for job in jobs}:
+            self._rows.pop(job_id)['frame'].destroy()
+
+        for index, job in enumerate(jobs):
+            if job['id'] not in self._rows:
+                self._rows[job['id']] = self.create_row(job['id'])
+            self.update_row(self._rows[job['id']], job, index)
+
+        if jobs:
+            self._empty_label.grid_forget()
+        else:
+            self._empty_label.grid(row=0, column=0, pady=20)
+
+        self.after(self.REFRESH_INTERVAL, self.refresh)
+
+    def create_row(self, job_id):
+        """ Creates the widgets of job `job_id`'s row """
+        frame = ctk.CTkFrame(self._jobs_frame, fg_color="#1f1f1f", corner_radius=3)
+        frame.columnconfigure(0, weight=1)
+
+        name_label = ctk.CTkLabel(frame, font=(f"{self.FONT} semibold", 15),
+                                  text_color=self.TEXT_COLOR, anchor="w")
+        name_label.grid(row=0, column=0, sticky="w", padx=10)
+        status_label = ctk.CTkLabel(frame, font=(self.FONT, 13),
+                                    text_color="#999999", anchor="w")
+        status_label.grid(row=1, column=0, sticky="w", padx=10)
+
+        progress_bar = ttk.Progressbar(frame)
+        progress_bar.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 5))
+
+        button_toggle = ctk.CTkButton(frame, width=80, height=28,
+                                      corner_radius=4,
+                                      font=(f"{self.FONT} bold", 13),
+                                      text_color=self.TEXT_COLOR,
+                                      border_width=1,
+                                      border_color=self.BORDER_COLOR,
+                                      hover_color="#046DB9",
+                                      fg_color="#353535",
+                                      command=lambda: self.toggle_job(job_id))
+        button_toggle.grid(row=0, column=1, rowspan=3, padx=5)
+
+        button_remove = ctk.CTkButton(frame, width=80, height=28,
+                                      text="Remove",
+                                      corner_radius=4,
+                                      font=(f"{self.FONT} bold", 13),
+                                      text_color=self.TEXT_COLOR,
+                                      border_width=1,
+                                      border_color=self.BORDER_COLOR,
+                                      hover_color="#7C0902",
+                                      fg_color="#353535",
+                                      command=lambda: self.remove_job(job_id))
+        button_remove.grid(row=0, column=2, rowspan=3, padx=(5, 10))
+
+        return {"frame": frame, "name": name_label, "status": status_label,
+                "progress": progress_bar, "toggle": button_toggle}
+
+    def update_row(self, row, job, index):
+        """ Shows `job` in its `row` (at `index` in the queue) """
+        row['frame'].grid(row=index, column=0, sticky="ew", padx=5, pady=3)
+        row['name'].configure(text=f"{job['album'] or job['save_path']}")
+
+        done = job['completed'] + job['failed']
+        status = f"{job['state'].capitalize()} | {job['completed']} of {job['total']} images"
+        if job['failed']:
+            status += f" | {job['failed']} failed"
+        if job['state'] == "running":
+            rate = self.backend.to_human_readable_storage(job['bytes_per_second'])
+            status += f" | {rate}/s"
+        if job['error']:
+            status += f" | {job['error']}"
+        row['status'].configure(text=status)
+        row['progress']['value'] = done / job['total'] * 100 if job['total'] else 0
+
+        # Pause a queued/running job, resume a paused one, retry a failed one
+        if job['state'] in ("queued", "running"):
+            row['toggle'].configure(text="Pause", state="normal")
+        elif job['state'] == "paused":
+            row['toggle'].configure(text="Resume", state="normal")
+        elif job['failed'] or job['error']:
+            row['toggle'].configure(text="Retry", state="normal")
+        else:
+            row['toggle'].configure(text="Done", state="disabled")
+
+    def toggle_job(self, job_id):
+        """ Pauses job `job_id` if it is queued or running, resumes it otherwise """
+        job = self.download_queue.get(job_id)
+        if job is None:
+            return
+
+        if job['state'] in ("queued", "running"):
+            self.download_queue.pause(job_id)
+        else:
+            self.download_queue.resume(job_id)
+
+    def remove_job(self, job_id):
+        """ Removes job `job_id` from the queue (the downloaded images stay) """
         try:
-            if not self.image_downloading_event.is_set():
-                self.image_downloading_event.set()
-        except Exception as e:
-            print("Error occurred:", e)
+            self.download_queue.remove(job_id)
+        except KeyError as e:
+            print(e)
 
+    def place_in_center(self, width, height):
+        """ Places `self` in the center of the screen """
+        x = self.winfo_screenwidth() // 2 - width // 2
+        y = self.winfo_screenheight() // 2 - height // 2
+
+        geo_string = f"{width}x{height}+{x}+{y}"
+        self.geometry(geo_string)
+
+    def get_focus_force(self, after: int):
+        """ 
+        ### Get Focus Force
+        `DownloadQueueDialog` gets focus forcefully after `after` milliseconds.
+        """
+        self.after(after, self.lift)
+        self.after(after, self.focus_force)
+
+    def close_dialog(self):
+        """
+        ### Close Dialog
+        Close the window (the queue keeps downloading)
+        """
         self.after(0, self.destroy)
 
 
@@ -966,6 +1292,7 @@ class ImageItemFrame(ctk.CTkFrame):
                  image_type, size,
                  dimensions, uploaded,
                  uploader, views, likes,
+                 session=None,
                  *args, **kwargs):
 
         super().__init__(master, height=100,
@@ -979,6 +1306,8 @@ class ImageItemFrame(ctk.CTkFrame):
 
         # * Add thumbnail
         self.thumbnail = None
+        # Shared keep-alive session (if given) to load the thumbnail with
+        self.session = session
         self.load_thumbnail(thumb_url, size=80)
         ctk.CTkLabel(self, text="", image=self.thumbnail).grid(
             row=0, column=0, padx=5, pady=5, sticky="w")
@@ -1029,14 +1358,14 @@ class ImageItemFrame(ctk.CTkFrame):
 
         # Views label
         self.views_icon = ctk.CTkImage(
-            dark_image=Image.open("assets\\views_light_16px.png"))
+            dark_image=load_icon("views_light_16px.png"))
         ctk.CTkLabel(self.view_likes_frame, text=f"{views} views", image=self.views_icon,
                      font=("Segoe UI bold", 15), text_color=details_color, compound="right",
                      anchor="s").grid(row=0, padx=5, pady=5, sticky="e")
 
         # Likes Label
         self.likes_icon = ctk.CTkImage(
-            dark_image=Image.open("assets\\likes_light_16px.png"))
+            dark_image=load_icon("likes_light_16px.png"))
         ctk.CTkLabel(self.view_likes_frame, text=f" {likes} likes ", image=self.likes_icon,
                      font=("Segoe UI bold", 15), text_color=details_color, compound="right",
                      anchor="n").grid(row=1, padx=5, pady=5, sticky="e")
@@ -1047,7 +1376,10 @@ class ImageItemFrame(ctk.CTkFrame):
         loads the thumbnail and stores a reference in `self.thumbnail`
         """
         try:
-            raw_data = requests.get(url).content
+            http = self.session
+            if http is None:
+                import requests as http
+            raw_data = http.get(url, timeout=(15, 30)).content
             image = Image.open(BytesIO(raw_data))
 
             self.thumbnail = ctk.CTkImage(image, size=(size, size))
@@ -1055,5 +1387,5 @@ class ImageItemFrame(ctk.CTkFrame):
             # ? Uncomment to print error
             # print("Thumbnail not found: {}".format(e))
             # ? Load default image thumbnail
-            self.thumbnail = ctk.CTkImage(Image.open(
-                "assets\\thumb_preview.jpg"), size=(80, 80))
+            self.thumbnail = ctk.CTkImage(load_icon(
+                "thumb_preview.jpg"), size=(80, 80))
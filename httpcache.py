@@ -0,0 +1,252 @@
+"""
+Persistent on-disk cache of HTTP responses (used by the scraper)
+
+Every response is stored under the SHA-1 of its url as two files:
+`<key>.body` (the raw body) and `<key>.json` (its metadata & parsed data).
+"""
+
+import os
+from os import path
+import json
+import hashlib
+from threading import Lock, get_ident
+from time import time
+
+
+class CachedResponse:
+    """
+    ### Cached Response
+    The part of `requests.Response` the scraper uses, served from the cache.
+    """
+
+    def __init__(self, url: str, content: bytes, encoding: str, status_code: int = 200,
+                 from_cache: bool = True, not_modified: bool = False):
+        self.url = url
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.status_code = status_code
+        # `True` if body came from the disk (revalidated)
+        self.from_cache = from_cache
+        # `True` if the server confirmed the cached body is unchanged
+        self.not_modified = not_modified
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+    def raise_for_status(self):
+        """Does nothing, only successful responses are cached"""
+
+
+class HttpCache:
+    """
+    ### HTTP Cache
+    Caches responses on disk, keyed by url.
+
+    ```
+    max_age        = seconds after which an unused response is deleted
+    max_size       = bytes the cache may take on disk (least recently used go first)
+    evict_interval = seconds between two evictions of old responses
+    ```
+
+    Every cached response is revalidated with `If-None-Match`/`If-Modified-Since`
+    (an album may have new images at any time), a `304 Not Modified` answer
+    serves the cached body (and its parsed data).
+    """
+
+    def __init__(self, cache_dir: str = "cache", max_age: int = 30 * 24 * 3600,
+                 max_size: int = 512 * 1024 ** 2, evict_interval: int = 3600):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_size = max_size
+        self.evict_interval = evict_interval
+
+        if not path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+        self._lock = Lock()
+        # Responses unchanged (304) & fetched anew
+        self.revalidated = 0
+        self.misses = 0
+        # Old responses go at start-up (sets `self.size` & `self._last_evict`)
+        self.evict()
+
+    def fetch(self, url: str, send):
+        """
+        ### Fetch
+        Returns the response of `url`, from the cache if possible.
+
+        `send(headers)` must send the actual GET request (with the extra
+        conditional `headers`) and return a `requests.Response`.
+        """
+        meta = self.lookup(url)
+
+        # * Cached > revalidate
+        headers = {}
+        if meta:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        response = send(headers)
+
+        if meta and response.status_code == 304:
+            self._count("revalidated")
+            return self._cached_response(url, meta, not_modified=True)
+
+        self._count("misses")
+        if response.status_code == 200:
+            self.store(url, response)
+
+        return response
+
+    def stats(self):
+        """
+        ### Stats
+        Returns the revalidations & misses of the cache, its hit rate (share
+        of responses not downloaded again) and its size on disk.
+        """
+        with self._lock:
+            served = self.revalidated + self.misses
+            return {
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": self.revalidated / served if served else None,
+                "size": self.size,
+            }
+
+    def lookup(self, url: str):
+        """
+        ### Lookup
+        Returns the metadata of the cached `url` or `None` if not cached.
+        """
+        meta_path, body_path = self._paths(url)
+        if not path.isfile(body_path):
+            return None
+
+        try:
+            with open(meta_path) as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url: str, response):
+        """
+        ### Store
+        Stores `response` of `url` in the cache (dropping its parsed data).
+        """
+        meta_path, body_path = self._paths(url)
+        old_size = path.getsize(body_path) if path.isfile(body_path) else 0
+
+        self._write_atomically(body_path, response.content)
+        self._write_meta(url, {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "encoding": response.encoding,
+            "stored_at": time(),
+            "parsed": None,
+        })
+
+        with self._lock:
+            self.size += len(response.content) - old_size
+            due = self.size > self.max_size or \
+                time() - self._last_evict >= self.evict_interval
+
+        if due:
+            self.evict()
+
+    def get_parsed(self, url: str):
+        """
+        ### Get Parsed
+        Returns the parsed data stored with the cached `url` (or `None`).
+        """
+        meta = self.lookup(url)
+        return meta['parsed'] if meta else None
+
+    def put_parsed(self, url: str, parsed):
+        """
+        ### Put Parsed
+        Stores the `parsed` data of the cached `url`, so an unchanged page
+        doesn't need to be parsed again.
+        """
+        meta = self.lookup(url)
+        if meta:
+            meta['parsed'] = parsed
+            self._write_meta(url, meta)
+
+    def evict(self):
+        """
+        ### Evict
+        Deletes the responses older than `self.max_age`, then the least
+        recently used ones until the cache fits in `self.max_size`.
+        """
+        with self._lock:
+            self._last_evict = time()
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith(".body"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size,
+                                    entry.path[:-len(".body")]))
+
+            # Least recently used first
+            entries.sort()
+            now = time()
+            size = sum(entry[1] for entry in entries)
+            for last_used, entry_size, base in entries:
+                if now - last_used < self.max_age and size <= self.max_size:
+                    break
+
+                for filepath in (base + ".body", base + ".json"):
+                    try:
+                        os.remove(filepath)
+                    except OSError:
+                        pass
+                size -= entry_size
+
+            self.size = size
+
+    def clear(self):
+        """
+        ### Clear
+        Deletes every cached response.
+        """
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith((".body", ".json")):
+                    os.remove(entry.path)
+            self.size = 0
+
+    def _cached_response(self, url, meta, not_modified=False):
+        """Reads the cached body of `url` and marks it as recently used"""
+        body_path = self._paths(url)[1]
+        with open(body_path, "rb") as body:
+            content = body.read()
+        os.utime(body_path)
+
+        return CachedResponse(url, content, meta.get('encoding'),
+                              not_modified=not_modified)
+
+    def _count(self, counter: str):
+        """Adds one to `counter` (revalidated or misses)"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _write_meta(self, url, meta):
+        """Writes the metadata of `url`"""
+        self._write_atomically(self._paths(url)[0], json.dumps(meta).encode())
+
+    def _write_atomically(self, filepath, data: bytes):
+        """Writes `data` to a temp file and renames it to `filepath`"""
+        temp_path = f"{filepath}.{os.getpid()}.{get_ident()}.tmp"
+        with open(temp_path, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, filepath)
+
+    def _paths(self, url):
+        """Returns the `(metadata, body)` file paths of `url`"""
+        key = hashlib.sha1(url.encode()).hexdigest()
+        base = path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
@@ -0,0 +1,175 @@
+"""
+Content-addressed store of downloaded images
+
+Every downloaded image is kept once, under the SHA-256 digest of its bytes,
+and placed into album folders as a hardlink (or a reflink, or a copy as a
+last resort). An index of `image url > digest` lets a download of an already
+stored image skip the transfer entirely.
+
+```
+store_dir/
+    index.jsonl                 {"url": "<image url>", "digest": "<sha256>", "size": 123}
+    objects/ab/abcdef...        the image bytes
+```
+"""
+
+import os
+from os import path
+import json
+import shutil
+from threading import Lock
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no reflinks
+    fcntl = None
+
+# `ioctl` cloning a file's extents (Linux: btrfs, XFS...)
+FICLONE = 0x40049409
+
+
+class ImageStore:
+    """
+    ### Image Store
+    Content-addressed store of images in `store_dir`.
+
+    ```
+    link_mode = how images are placed into album folders:
+                "auto" (hardlink > reflink > copy), "hardlink", "reflink" or "copy"
+    ```
+    """
+
+    LINK_MODES = ("auto", "hardlink", "reflink", "copy")
+
+    def __init__(self, store_dir: str = "store", link_mode: str = "auto"):
+        if link_mode not in self.LINK_MODES:
+            raise ValueError(
+                f"Invalid Link Mode: link_mode must be one of {', '.join(self.LINK_MODES)}.")
+        self.store_dir = store_dir
+        self.link_mode = link_mode
+
+        self.objects_dir = path.join(store_dir, "objects")
+        if not path.isdir(self.objects_dir):
+            os.makedirs(self.objects_dir)
+
+        self._lock = Lock()
+        # Image url > digest
+        self.index = {}
+        self.index_path = path.join(store_dir, "index.jsonl")
+        self.load_index()
+        self._index_file = None
+
+    def load_index(self):
+        """
+        ### Load Index
+        Reads the `url > digest` index (a torn last line is ignored).
+        """
+        if not path.isfile(self.index_path):
+            return
+
+        with open(self.index_path, "rb") as index_file:
+            for line in index_file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self.index[entry['url']] = entry['digest']
+
+    def object_path(self, digest: str):
+        """Returns the path of the stored image `digest`"""
+        return path.join(self.objects_dir, digest[:2], digest)
+
+    def lookup(self, url: str):
+        """
+        ### Lookup
+        Returns the digest of image `url` if it is stored, otherwise `None`.
+        """
+        with self._lock:
+            digest = self.index.get(url)
+        if digest and path.isfile(self.object_path(digest)):
+            return digest
+        return None
+
+    def put(self, filepath: str, digest: str, url: str = None):
+        """
+        ### Put
+        Moves the downloaded image `filepath` (of SHA-256 `digest`) into the
+        store and maps `url` to it. If the same bytes are already stored,
+        `filepath` is simply removed.
+        """
+        object_path = self.object_path(digest)
+        if path.isfile(object_path):
+            os.remove(filepath)
+        else:
+            os.makedirs(path.dirname(object_path), exist_ok=True)
+            try:
+                os.replace(filepath, object_path)
+            except OSError:
+                # Store on another drive
+                shutil.move(filepath, object_path)
+
+        if url:
+            self._index(url, digest, path.getsize(object_path))
+
+    def place(self, digest: str, filepath: str):
+        """
+        ### Place
+        Puts the stored image `digest` at `filepath` (atomically) as a
+        hardlink, a reflink or a copy, depending on `self.link_mode` and on
+        what the file system supports.
+        """
+        object_path = self.object_path(digest)
+        temp_path = filepath + ".link"
+        if path.lexists(temp_path):
+            os.remove(temp_path)
+
+        modes = ("hardlink", "reflink", "copy") if self.link_mode == "auto" \
+            else (self.link_mode,)
+        for mode in modes:
+            try:
+                getattr(self, f"_{mode}")(object_path, temp_path)
+                break
+            except OSError:
+                if path.lexists(temp_path):
+                    os.remove(temp_path)
+                if mode == modes[-1]:
+                    raise
+
+        os.replace(temp_path, filepath)
+
+    def close(self):
+        """Closes the index file"""
+        with self._lock:
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+
+    def _index(self, url: str, digest: str, size: int):
+        """Maps `url` to `digest` (appended to the index file)"""
+        with self._lock:
+            if self.index.get(url) == digest:
+                return
+            self.index[url] = digest
+
+            if self._index_file is None:
+                self._index_file = open(self.index_path, "a", encoding="utf-8")
+            self._index_file.write(json.dumps(
+                {"url": url, "digest": digest, "size": size}) + "\n")
+            self._index_file.flush()
+
+    @staticmethod
+    def _hardlink(source: str, destination: str):
+        os.link(source, destination)
+
+    @staticmethod
+    def _reflink(source: str, destination: str):
+        if fcntl is None:
+            raise OSError("reflinks are not supported on this platform")
+
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+    @staticmethod
+    def _copy(source: str, destination: str):
+        shutil.copyfile(source, destination)
@@ -0,0 +1,356 @@
+"""
+Headless command-line entry point (no display needed)
+
+```
+python -m imgcrawler scrape URL [-o album.json] [--since old.json]
+python -m imgcrawler download album.json SAVE_DIR [--quality low] [--order smallest]
+python -m imgcrawler missing album.json SAVE_DIR [--verify]
+python -m imgcrawler queue add album.json SAVE_DIR     (then: queue run)
+python -m imgcrawler export album.json SAVE_DIR --format csv --name album
+```
+
+Progress is printed to `stderr` as JSON lines (one object per event), scraped
+data goes to `stdout` unless `-o` is given. Every subcommand imports only what
+it needs, so the command starts in milliseconds.
+
+Only `scrape` keeps state next to it (`--cache-dir` & `--journal-dir`, relative
+to the working directory), the other commands only write where they are told.
+"""
+
+import argparse
+import json
+import sys
+from os import path
+from threading import Event
+
+
+def emit(event: str, **fields):
+    """Prints a machine-readable progress `event` (a JSON line) to stderr"""
+    sys.stderr.write(json.dumps({"event": event, **fields}) + "\n")
+    sys.stderr.flush()
+
+
+def load_data(backend, filepath: str):
+    """Returns the presaved data in `filepath` or exits if it is not valid"""
+    data = backend.get_presaved_data(filepath)
+    if data is None:
+        emit("error", message=f"'{filepath}' is not a valid ImgCrawler json file")
+        sys.exit(1)
+    return data
+
+
+def start_metrics(backend, args):
+    """Starts the metrics exporter of `backend` if asked for"""
+    if args.metrics_port is not None or args.metrics_dump:
+        exporter = backend.start_metrics(port=args.metrics_port,
+                                         dump_path=args.metrics_dump,
+                                         interval=args.metrics_interval)
+        emit("metrics", port=exporter.port, dump=args.metrics_dump)
+
+
+def add_metrics_arguments(parser):
+    """Adds the metrics options to a subcommand's `parser`"""
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve metrics on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-dump", metavar="JSON",
+                        help="rewrite metrics to this json file periodically")
+    parser.add_argument("--metrics-interval", type=float, default=10.0, metavar="SECONDS",
+                        help="seconds between metrics samples (default: 10)")
+
+
+def scrape(args, cancel: Event):
+    """
+    ### Scrape
+    Scrapes an album and writes its data as json.
+    """
+    from backend import Backend
+
+    backend = Backend(engine=args.engine, max_workers=args.workers,
+                      cache_dir=None if args.no_cache else args.cache_dir,
+                      journal_dir=args.journal_dir)
+    resume = not args.no_resume
+    start_metrics(backend, args)
+
+    if args.since:
+        # Incremental: only the images missing from the snapshot are scraped
+        emit("start", url=args.url, since=args.since)
+        response = backend.get_incremental_response(
+            args.url, cancel, load_data(backend, args.since), resume=resume)
+        if response is None:
+            return None
+        data, delta = response
+        emit("delta", new_images=len(delta))
+    else:
+        emit("start", url=args.url)
+        data = []
+        for image in backend.stream_response(args.url, cancel, resume=resume):
+            data.append(image)
+            emit("image", count=len(data), title=image['title'],
+                 image_link=image['image_link'])
+
+    if cancel.is_set():
+        return None
+
+    if args.output:
+        with open(args.output, "w") as jsonfile:
+            json.dump(data, jsonfile, indent=4)
+    else:
+        json.dump(data, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+
+    emit("done", images=len(data), failed=len(backend.get_api().failed_links))
+    if args.stats:
+        emit("stats", **backend.stats.snapshot())
+    backend.stop_metrics()
+    return data
+
+
+def download(args, cancel: Event):
+    """
+    ### Download
+    Downloads the images of a presaved json file.
+    """
+    from backend import Backend
+
+    backend = Backend(download_workers=args.workers, store_dir=args.store,
+                      cache_dir=None, journal_dir=None)
+    data = load_data(backend, args.data)
+    if args.limit_rate:
+        backend.bandwidth.rate = backend.parse_size(args.limit_rate)
+    quality = "High Quality" if args.quality == "high" else "Low Quality"
+    start_metrics(backend, args)
+
+    emit("start", images=len(data), save_path=args.save_path)
+    backend.download_images(data, quality, args.save_path, cancel,
+                            lambda total, count: emit("image", count=count, total=total),
+                            album=album_name(args.data), order=args.order,
+                            pinned=args.pin or ())
+    if cancel.is_set():
+        return None
+
+    emit("done", images=len(data))
+    if args.stats:
+        emit("stats", **backend.download_stats.snapshot())
+    backend.stop_metrics()
+    return data
+
+
+def missing(args, cancel: Event):
+    """
+    ### Missing
+    Reports the images of a presaved json file not downloaded yet into the
+    save path (read from its manifest, the images themselves aren't probed).
+    """
+    from backend import Backend
+
+    backend = Backend(cache_dir=None, journal_dir=None)
+    report = backend.get_missing_report(args.save_path, album_name(args.data),
+                                        verify=args.verify)
+
+    emit("summary", **report['summary'])
+    json.dump(report['missing'], sys.stdout, indent=4)
+    sys.stdout.write("\n")
+    return report
+
+
+def queue(args, cancel: Event):
+    """
+    ### Queue
+    Manages the persistent download queue: adds, lists, pauses, resumes &
+    removes jobs, or runs the queue until every job is done.
+    """
+    from backend import Backend
+
+    backend = Backend(download_workers=args.workers, cache_dir=None, journal_dir=None)
+    if args.limit_rate:
+        backend.bandwidth.rate = backend.parse_size(args.limit_rate)
+    download_queue = backend.open_download_queue(args.queue_dir, start=False)
+
+    if args.action == "add":
+        data = load_data(backend, args.data)
+        job_id = download_queue.add(
+            data, args.save_path, "High Quality" if args.quality == "high" else "Low Quality",
+            album=album_name(args.data), order=args.order)
+        emit("added", id=job_id, images=len(data), save_path=args.save_path)
+        return job_id
+
+    if args.action == "list":
+        jobs = download_queue.snapshot()
+        json.dump(jobs, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+        return jobs
+
+    if args.action in ("pause", "resume", "remove"):
+        getattr(download_queue, args.action)(args.id)
+        emit(args.action, id=args.id)
+        return args.id
+
+    # * run: drains the queue, Ctrl+C stops it (jobs continue on the next run)
+    download_queue.add_listener(
+        lambda event, job: emit("job", change=event, id=job['id'], state=job['state'],
+                                completed=job['completed'], total=job['total'],
+                                failed=job['failed']))
+    start_metrics(backend, args)
+    download_queue.start()
+    try:
+        while not cancel.is_set() and not download_queue.wait(0.5):
+            pass
+    finally:
+        download_queue.stop()
+        backend.stop_metrics()
+
+    if cancel.is_set():
+        return None
+    emit("done", jobs=len(download_queue.jobs))
+    return download_queue.jobs
+
+
+def album_name(filepath: str):
+    """Returns the album name of the json file `filepath` (in manifests)"""
+    return path.splitext(path.basename(filepath))[0]
+
+
+def export(args, cancel: Event):
+    """
+    ### Export
+    Exports a presaved json file as JSON or CSV.
+    """
+    from backend import Backend
+
+    backend = Backend(cache_dir=None, journal_dir=None)
+    data = load_data(backend, args.data)
+    name = args.name or "data"
+
+    backend.download_data(data, args.format.upper(), name, args.save_path,
+                          lambda: emit("done", images=len(data), format=args.format,
+                                       filename=name))
+    return data
+
+
+def build_parser():
+    """Returns the argument parser of the command line"""
+    parser = argparse.ArgumentParser(
+        prog="imgcrawler", description="Scrape & download imgpile.com albums")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # * scrape
+    scrape_parser = commands.add_parser("scrape", help="scrape an album")
+    scrape_parser.add_argument("url", help="url of the album")
+    scrape_parser.add_argument("-o", "--output",
+                               help="json file to write (default: stdout)")
+    scrape_parser.add_argument("--since", metavar="JSON",
+                               help="previous json of the album, only new images are scraped")
+    scrape_parser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                               help="scraping engine (default: sync)")
+    scrape_parser.add_argument("--workers", type=int, default=8,
+                               help="image pages scraped at once (default: 8)")
+    scrape_parser.add_argument("--no-resume", action="store_true",
+                               help="start over instead of resuming an interrupted scrape")
+    scrape_parser.add_argument("--cache-dir", default="cache", metavar="DIR",
+                               help="directory of the page cache (default: cache)")
+    scrape_parser.add_argument("--no-cache", action="store_true",
+                               help="don't cache pages (nothing is written to --cache-dir)")
+    scrape_parser.add_argument("--journal-dir", default="journals", metavar="DIR",
+                               help="directory of the checkpoints of interrupted scrapes "
+                               "(default: journals)")
+    scrape_parser.add_argument("--stats", action="store_true",
+                               help="print per-phase timings & counters when done")
+    add_metrics_arguments(scrape_parser)
+    scrape_parser.set_defaults(handler=scrape)
+
+    # * download
+    download_parser = commands.add_parser("download",
+                                          help="download the images of a json file")
+    download_parser.add_argument("data", help="json file created by ImgCrawler")
+    download_parser.add_argument("save_path", help="existing directory to save in")
+    download_parser.add_argument("--quality", choices=["high", "low"], default="high",
+                                 help="quality of the images (default: high)")
+    download_parser.add_argument("--workers", type=int, default=8,
+                                 help="images downloaded at once (default: 8)")
+    download_parser.add_argument("--order", choices=["order", "smallest", "largest"],
+                                 default="order",
+                                 help="download order by image size (default: as scraped)")
+    download_parser.add_argument("--pin", action="append", metavar="LINK",
+                                 help="image link to download before all others (repeatable)")
+    download_parser.add_argument("--limit-rate", metavar="SIZE",
+                                 help="cap the download to SIZE per second, e.g. 500KB or 2MB")
+    download_parser.add_argument("--store", metavar="DIR",
+                                 help="keep every image once in this content-addressed store "
+                                 "and hardlink it into SAVE_DIR")
+    download_parser.add_argument("--stats", action="store_true",
+                                 help="print per-phase timings & counters when done")
+    add_metrics_arguments(download_parser)
+    download_parser.set_defaults(handler=download)
+
+    # * missing
+    missing_parser = commands.add_parser("missing",
+                                         help="list the images of a json file not downloaded yet")
+    missing_parser.add_argument("data", help="json file created by ImgCrawler")
+    missing_parser.add_argument("save_path", help="directory the images are saved in")
+    missing_parser.add_argument("--verify", action="store_true",
+                                help="check the complete files on disk first "
+                                "(missing or truncated ones are downloaded again)")
+    missing_parser.set_defaults(handler=missing)
+
+    # * queue
+    queue_parser = commands.add_parser("queue", help="persistent queue of album downloads")
+    queue_parser.add_argument("--queue-dir", default="downloads", metavar="DIR",
+                              help="directory the queue is kept in (default: downloads)")
+    queue_parser.add_argument("--workers", type=int, default=8,
+                              help="images downloaded at once by `run` (default: 8)")
+    queue_parser.add_argument("--limit-rate", metavar="SIZE",
+                              help="cap `run` to SIZE per second, e.g. 500KB or 2MB")
+    queue_actions = queue_parser.add_subparsers(dest="action", required=True)
+
+    queue_add_parser = queue_actions.add_parser("add", help="queue the images of a json file")
+    queue_add_parser.add_argument("data", help="json file created by ImgCrawler")
+    queue_add_parser.add_argument("save_path", help="existing directory to save in")
+    queue_add_parser.add_argument("--quality", choices=["high", "low"], default="high",
+                                  help="quality of the images (default: high)")
+    queue_add_parser.add_argument("--order", choices=["order", "smallest", "largest"],
+                                  default="order",
+                                  help="download order by image size (default: as scraped)")
+    queue_actions.add_parser("list", help="print the jobs as json")
+    queue_run_parser = queue_actions.add_parser(
+        "run", help="download until every job is done (Ctrl+C stops, run again to continue)")
+    add_metrics_arguments(queue_run_parser)
+    for action in ("pause", "resume", "remove"):
+        queue_actions.add_parser(action, help=f"{action} a job").add_argument(
+            "id", help="id of the job")
+    queue_parser.set_defaults(handler=queue)
+
+    # * export
+    export_parser = commands.add_parser("export",
+                                        help="export a json file as JSON or CSV")
+    export_parser.add_argument("data", help="json file created by ImgCrawler")
+    export_parser.add_argument("save_path", help="existing directory to save in")
+    export_parser.add_argument("--format", choices=["json", "csv"], default="csv",
+                               help="format of the file (default: csv)")
+    export_parser.add_argument("--name", help="filename without extension (default: data)")
+    export_parser.set_defaults(handler=export)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    # Set on Ctrl+C, workers stop & interrupted scrapes keep their journal
+    cancel = Event()
+    try:
+        result = args.handler(args, cancel)
+    except KeyboardInterrupt:
+        cancel.set()
+        result = None
+    except Exception as e:
+        emit("error", message=str(e))
+        return 1
+
+    if result is None:
+        emit("cancelled")
+        return 130
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
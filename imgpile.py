@@ -44,106 +44,497 @@ It should look something like below:
 
 import requests
 from requests.exceptions import ConnectTimeout, ReadTimeout, MissingSchema
-from bs4 import BeautifulSoup
-from bs4 import SoupStrainer
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Event, Lock, Thread
+from queue import Queue
+from urllib.parse import urlparse
+from importlib.util import find_spec
+import html as html_lib
+import re
+from ratelimit import AdaptiveLimiter, RequestCancelled
+from cancel import CancellableAdapter, cancel_scope, connect_time
+from retry import LatencyTracker, RetryPolicy
+from stats import CrawlStats
+from time import monotonic
 
 
 class ImgPile:
-    def __init__(self) -> None:
-        self.headers = {'User-Agent': 'Mozilla/5.0'}
+    # Image page parser backends
+    # "fast"        > targeted regex extractor, falls back to the tree parser
+    # "lxml"        > BeautifulSoup over the C-accelerated lxml tree builder
+    # "html.parser" > BeautifulSoup over the pure-python tree builder
+    PARSERS = ("fast", "lxml", "html.parser")
+
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 4,
+                 session=None, headers=None, timeout=(15, 30), parser: str = "fast",
+                 cache=None, limiter=None, retry=None, hedge: bool = False,
+                 stats=None) -> None:
+        self.headers = headers or {'User-Agent': 'Mozilla/5.0'}
         # Timeout values:> connect timout, read timeout
-        self.timeout = (15, 30)
+        self.timeout = timeout
+
+        # Keep-alive session (connection pool) shared by every request
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount("http://", CancellableAdapter())
+            session.mount("https://", CancellableAdapter())
+        self.session = session
+
+        # On-disk response cache (`httpcache.HttpCache`), `None` disables it
+        self.cache = cache
+
+        # Number of image pages extracted at the same time
+        self.max_workers = max_workers
+        # Maximum number of simultaneous requests sent to a single host
+        self.per_host_limit = per_host_limit
+        # Adaptive (AIMD) concurrency limit of every host, up to `per_host_limit`
+        if limiter is None:
+            limiter = AdaptiveLimiter(maximum=per_host_limit)
+        self.limiter = limiter
+
+        # Retry policy of failed requests (backoff & per-crawl budget)
+        self.retry = retry or RetryPolicy()
+        # Hedging: a request slower than the p95 latency is sent again and
+        # the first response wins
+        self.hedge = hedge
+        self.hedges = 0
+        self._hedges_lock = Lock()
+        self.latencies = LatencyTracker()
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=max_workers * 2) if hedge else None
+
+        # Per-phase timings & counters of the current (or last) crawl
+        self.stats = stats if stats is not None else CrawlStats()
 
-    def get(self, url: str, event):
+        # Image links that could not be extracted in the last crawl
+        self.failed_links = []
+        # Checkpoint journal of the current crawl (if any)
+        self.journal = None
+        # Worker pool of the running (concurrent) crawl
+        self._executor = None
+
+        # Parser backend of image pages
+        if parser not in self.PARSERS:
+            raise ValueError(
+                f"Invalid Parser: parser must be one of {', '.join(self.PARSERS)}.")
+        self.parser = parser
+        # Tree builder used by BeautifulSoup (lxml only if it is installed)
+        if parser != "html.parser" and find_spec("lxml"):
+            self.tree_builder = "lxml"
+        else:
+            self.tree_builder = "html.parser"
+
+    def get(self, url: str, event, concurrent: bool = True, known=None, journal=None):
         """ 
         ### Get
         This method will get the data you need regarding given `url`.
+
+        if `concurrent` is `True`, image pages are extracted by a pool of
+        `self.max_workers` threads, otherwise one after another.
+        Either way, `master_data` keeps the order of the album.
+
+        `known` is an optional dictionary of `link_key(image_link) > image data`
+        (e.g. a previous scrape), those images are not extracted again.
+
+        `journal` is an optional `journal.CrawlJournal`, the crawl resumes from
+        what it holds and records its progress in it.
+        """
+        # Stores all pages & images
+        master_data = list(self.iter_images(
+            url, event, concurrent, known, journal))
+
+        # Incase, User cancelled the operation
+        if self.event.is_set():
+            return None
+
+        return master_data
+
+    def iter_images(self, url: str, event, concurrent: bool = True, known=None, journal=None):
+        """ 
+        ### Iter Images
+        Same as `get` but yields every image's data (in album order) as soon
+        as it is extracted, instead of returning everything at the end.
+
+        Stops yielding as soon as `event` is set.
         """
         # Thread event (used to stop the event at user's will.)
         self.event = event
 
-        # Extract all pages
-        pages = self.extract_pages(url)
+        # Checkpoint journal, images extracted before the interruption are known
+        self.journal = journal
+        known = dict(known or {})
+        if journal is not None:
+            known.update({self.link_key(link): image_data
+                          for link, image_data in journal.records.items()})
 
-        # Stores all pages & images
-        master_data = []
-        # Iterate through every page and extract image links
-        for page in pages:
-            for link in self.extract_image_links(page):
-                try:
-                    if link and type(link) == str:
-                        master_data.append(self.extract_image_data(link))
-                except:
-                    # if anything goes wrong, skip to next
-                    pass
+        # New crawl, new retry budget & stats
+        self.retry.reset_budget()
+        self.failed_links = []
+        self.stats.reset()
+
+        try:
+            if concurrent:
+                yield from self._iter_images_concurrently(url, known)
+                return
+
+            # Walk through every page and extract its image links
+            for link in self.iter_image_links(url):
+                image_data = known.get(self.link_key(link)) or \
+                    self._extract_image_data_safely(link)
 
                 # Incase, User cancelled the operation
                 if self.event.is_set():
-                    return None
+                    return
 
-        return master_data
+                if image_data:
+                    yield image_data
+        finally:
+            self.stats.finish()
 
-    def extract_pages(self, start_page):
-        """Extracts all page links"""
-        # will hold page links
-        temp_pages = [start_page]
+    def _iter_images_concurrently(self, url, known):
+        """ 
+        ### Iter Images Concurrently
+        Fans the image pages of album `url` out across a bounded worker pool
+        and yields their data in album order.
+
+        Listing pages are walked in a background thread, so image pages are
+        handed to the workers as soon as their listing page is parsed, while
+        earlier results are already being yielded. An error walking the
+        listing pages is raised once the images before it are yielded.
+        """
+        executor = self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers)
+        # Futures in album order, `None` marks the end of the album
+        futures = Queue()
+        # Set when the consumer stops early
+        stop = Event()
+        # Holds the exception raised walking the listing pages (if any)
+        errors = []
 
-        def recurse(page):
-            # Accessing page
+        def submit_image_links():
             try:
-                response = requests.get(
-                    page, headers=self.headers, timeout=self.timeout)
-            except (MissingSchema, ConnectTimeout, ReadTimeout) as e:
-                print(e)
-                return None
+                for link in self.iter_image_links(url):
+                    if stop.is_set():
+                        break
 
-            # If user cancelled!
-            if self.event.is_set():
-                return None
+                    # Already known images are not extracted again
+                    image_data = known.get(self.link_key(link))
+                    if image_data:
+                        future = Future()
+                        future.set_result(image_data)
+                    else:
+                        future = executor.submit(
+                            self._extract_image_data_safely, link)
+                    futures.put(future)
+            except RuntimeError as e:
+                # Executor was shut down, consumer has stopped
+                if not stop.is_set():
+                    errors.append(e)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                futures.put(None)
 
-            # extracting next_page_link
-            pagination = SoupStrainer(
-                "ul", {"class": "content-listing-pagination visible"})
-            soup = BeautifulSoup(response.text, 'html.parser',
-                                 parse_only=pagination)
+        Thread(target=submit_image_links, daemon=True).start()
 
-            # Extract next_page_link
-            next_page = ""
+        try:
+            while True:
+                future = futures.get()
+                if future is None:
+                    break
+
+                image_data = future.result()
+                # Incase, User cancelled the operation
+                if self.event.is_set():
+                    return
+                if image_data:
+                    yield image_data
+        finally:
+            stop.set()
+            # Drop the queued pages (if cancelled) without waiting for them
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        # Listing walk failed, the album is incomplete
+        if errors and not self.event.is_set():
+            raise errors[0]
+
+    def queue_depth(self):
+        """ 
+        ### Queue Depth
+        Returns the number of image pages waiting for a worker in the running
+        crawl (`0` if none is running).
+        """
+        executor = self._executor
+        if executor is None:
+            return 0
+        return executor._work_queue.qsize()
+
+    @staticmethod
+    def link_key(link: str):
+        """ 
+        ### Link Key
+        Returns a normalized form of an image page `link`, so the same image
+        matches whatever the scheme, `www.` or trailing slash of its link.
+        """
+        parsed = urlparse(link.strip())
+        host = parsed.netloc.lower()
+        if host.startswith("www."):
+            host = host[4:]
+        return f"{host}{parsed.path.rstrip('/')}"
+
+    def iter_image_links(self, start_page):
+        """ 
+        ### Iter Image Links
+        Walks the listing pages starting from `start_page` and yields every
+        image link in album order.
+
+        Each listing page is requested & parsed only once, for both its
+        image links and its next page link. Pages already in `self.journal`
+        are not requested again.
+        """
+        # Links of journaled pages & the page to continue from
+        links, page, visited = self._resume_listing(start_page)
+        for link in links:
+            if link and type(link) == str:
+                yield link
+
+        while page and page not in visited:
+            visited.add(page)
+
+            # Accessing page (a failure is raised, the album would be incomplete)
             try:
-                next_page = soup.select_one("li.pagination-next a").get("href")
-            except AttributeError:
-                pass
-            if next_page:
-                temp_pages.append(next_page)
-                recurse(next_page)
-            else:
+                next_page, links = self._listing_page(page)
+            except RequestCancelled:
+                return
+
+            # If user cancelled!
+            if self.event.is_set():
                 return
 
-        # calling a recursive function to extract all pages
-        recurse(start_page)
-        return temp_pages
+            if self.journal is not None:
+                self.journal.page(page, links, next_page)
+            for link in links:
+                if link and type(link) == str:
+                    yield link
+
+            page = next_page
+
+    def _resume_listing(self, start_page):
+        """ 
+        ### Resume Listing
+        Returns a tuple of `(journaled image links, page to continue from,
+        visited pages)`, nothing is journaled if there is no `self.journal`.
+        """
+        if self.journal is None:
+            return [], start_page, set()
+        return self.journal.resume_listing(start_page)
+
+    def _extract_image_data_safely(self, link):
+        """ 
+        ### Extract Image Data Safely
+        Wrapper around `extract_image_data`, returns `None` if anything goes
+        wrong (the link is added to `self.failed_links`) or user cancelled the
+        operation.
+        """
+        # Incase, User cancelled before this worker started
+        if self.event.is_set():
+            return None
+
+        try:
+            image_data = self.extract_image_data(link)
+        except Exception as e:
+            # if anything goes wrong, skip to next (but remember it)
+            print(f"Image: '{link}' failed: {e}")
+            image_data = None
+
+        if image_data is None and not self.event.is_set():
+            self.failed_links.append(link)
+            self.stats.count("failed_images")
+        elif image_data:
+            self.stats.count("images")
+            if self.journal is not None:
+                self.journal.record(link, image_data)
+        return image_data
+
+    def fetch(self, url):
+        """ 
+        ### Fetch
+        Returns the response of `url`, from `self.cache` if it is still fresh
+        (or unchanged on the server), otherwise through the shared session.
+        """
+        if self.cache is None:
+            return self._send(url)
+
+        return self.cache.fetch(url, lambda headers: self._send(url, headers))
+
+    def _send(self, url, headers=None):
+        """ 
+        ### Send
+        Sends a GET request to `url` and returns the response, retrying it
+        according to `self.retry` (and hedging it if `self.hedge`).
+        """
+        event = getattr(self, "event", None)
+        return self.retry.call(lambda: self._send_hedged(url, headers), event)
+
+    def _send_hedged(self, url, headers=None):
+        """ 
+        ### Send Hedged
+        Sends a GET request to `url`, if no response came within the p95
+        latency, a duplicate request is sent and the first response wins.
+
+        The p95 is measured from the moment a request holds its slot, so is
+        the wait of the first request. No duplicate is sent while the host is
+        at its limit (it would only queue behind the first one).
+        """
+        hedge_after = self.latencies.percentile(95) if self.hedge else None
+        if hedge_after is None:
+            return self._send_once(url, headers)
+
+        # Set once the first request holds its slot (or gave up waiting)
+        holding = Event()
+        first = self._hedge_executor.submit(self._send_once, url, headers, holding)
+        first.add_done_callback(lambda _: holding.set())
+        holding.wait()
+
+        attempts = [first]
+        done, _ = wait(attempts, timeout=hedge_after)
+        if not done and self.limiter.has_room(url):
+            with self._hedges_lock:
+                self.hedges += 1
+            attempts.append(self._hedge_executor.submit(
+                self._send_once, url, headers))
+
+        # First successful response wins
+        pending = set(attempts)
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for attempt in done:
+                if attempt.exception() is None:
+                    # Release the connection of the loser when it completes
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    return attempt.result()
+                error = attempt.exception()
+
+        raise error
+
+    def _send_once(self, url, headers=None, holding=None):
+        """ 
+        ### Send Once
+        Sends a single GET request to `url` through the shared session and
+        returns the response (body already read). `holding` (an `Event`) is
+        set once the request got its slot in the host's limit.
+
+        Raises `RequestCancelled` as soon as the user cancels, even halfway
+        through the request.
+        """
+        event = getattr(self, "event", None)
+        with self.limiter.slot(url, event) as slot, cancel_scope(event):
+            if holding is not None:
+                holding.set()
+            # Forget the connects of requests sent outside of the stats
+            connect_time()
+            started = monotonic()
+            response = self.session.get(url, headers=headers,
+                                        timeout=self.timeout, stream=True)
+            ttfb = monotonic() - started
+            connected = connect_time()
+            slot.done(response)
+
+            # Body is still read within the slot, like a non-streamed request
+            with self.stats.timer("transfer"):
+                content = response.content
+
+        self.stats.record("ttfb", ttfb)
+        if connected:
+            self.stats.record("connect", connected)
+        self.stats.count("requests")
+        self.stats.count("scraped_bytes", len(content))
+        if response.ok:
+            self.latencies.add(monotonic() - started)
+        return response
+
+    def _parse_cached(self, url, response, parse):
+        """ 
+        ### Parse Cached
+        Returns `parse(response.text)`, reusing the data parsed last time if
+        `response` came unchanged from the cache.
+
+        Only the parse of the cached body is kept, an error page (never
+        stored by the cache) must not replace it.
+        """
+        from_cache = getattr(response, "from_cache", False)
+        if from_cache:
+            parsed = self.cache.get_parsed(url)
+            if parsed is not None:
+                return parsed
+
+        parsed = parse(response.text)
+        if self.cache is not None and (from_cache or response.status_code == 200):
+            self.cache.put_parsed(url, parsed)
+        return parsed
+
+    def _listing_page(self, page):
+        """ 
+        ### Listing Page
+        Requests & parses listing `page`, returns a tuple of its next page
+        link and its image links. Raises the error of a failed request or of
+        an error page (e.g. 404 or 503 after retries), it is no last page.
+        """
+        response = self.fetch(page)
+        response.raise_for_status()
+        self.stats.count("listing_pages")
+        return self._parse_cached(page, response, self.parse_listing_page)
+
+    def extract_pages(self, start_page):
+        """ 
+        ### Extract Pages
+        Returns the links of every listing page, starting from `start_page`
+        """
+        pages = []
+        page = start_page
+        while page and page not in pages:
+            pages.append(page)
+            page = self._listing_page(page)[0]
+        return pages
 
     def extract_image_links(self, page):
         """ 
         ### Extract Image Links
-        extracts all image links and yields the url
+        Yields the image links of listing `page`
         """
-        try:
-            # accessing current page
-            r = requests.get(page, headers=self.headers, timeout=self.timeout)
-        except (MissingSchema, ConnectTimeout, ReadTimeout) as e:
-            print(e)
-            yield None
+        yield from self._listing_page(page)[1]
+
+    def parse_listing_page(self, html: str):
+        """ 
+        ### Parse Listing Page
+        Parses a listing page's `html` once and returns a tuple of its next
+        page link (empty string on last page) and its image links.
+        """
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        # Keep only the pagination & the images container
+        listing = SoupStrainer(_is_listing_tag)
+        with self.stats.timer("parse"):
+            soup = BeautifulSoup(html, self.tree_builder, parse_only=listing)
+
+        with self.stats.timer("extract"):
+            # Extract next_page_link
+            next_page = ""
+            try:
+                next_page = soup.select_one(
+                    "ul.content-listing-pagination li.pagination-next a").get("href")
+            except AttributeError:
+                pass
 
-        # Extracting its HTML
-        content_div = SoupStrainer(
-            "div", attrs={"id": "content-listing-tabs"})
-        soup = BeautifulSoup(r.text, "html.parser", parse_only=content_div)
+            # Extracting image links
+            links = [tag['href']
+                     for tag in soup.select("div#content-listing-tabs a.image-container")]
 
-        # iterating through each image and extracting its image's page links
-        for tag in soup.select("a.image-container"):
-            # Extracting image link
-            yield tag['href']
+        return next_page, links
 
     def extract_image_data(self, image_url):
         """ 
@@ -152,49 +543,82 @@ class ImgPile:
         """
         try:
             # accessing image's page
-            r = requests.get(image_url, headers=self.headers,
-                             timeout=self.timeout)
+            r = self.fetch(image_url)
+        except RequestCancelled:
+            return None
         except (MissingSchema, ConnectTimeout, ReadTimeout) as e:
             print(e)
             return None
 
+        # Incase, User cancelled
+        if self.event.is_set():
+            return None
+
+        self.stats.count("image_pages")
+        return self._parse_cached(image_url, r, self.parse_image_data)
+
+    def parse_image_data(self, html: str):
+        """ 
+        ### Parse Image Data
+        Extracts the image data from an image page's `html` and returns it
+        as a dictionary, using the `self.parser` backend.
+
+        The "fast" backend falls back to the tree parser if it fails.
+        """
+        if self.parser == "fast":
+            try:
+                # A failed attempt isn't an extract, the tree parser times its own
+                with self.stats.timer("extract", failed_phase="extract_failed"):
+                    return fast_parse_image_data(html)
+            except ValueError:
+                # Page doesn't look like expected, let the tree parser try
+                pass
+
+        return self.soup_parse_image_data(html)
+
+    def soup_parse_image_data(self, html: str):
+        """ 
+        ### Soup Parse Image Data
+        Extracts the image data from an image page's `html` with BeautifulSoup
+        and returns it as a dictionary
+        """
+        from bs4 import BeautifulSoup, SoupStrainer
+
         # Extracting HTML
         link_div = SoupStrainer(
             "div", {"class": "content-width"})
-        soup = BeautifulSoup(
-            r.text, "html.parser", parse_only=link_div)
+        with self.stats.timer("parse"):
+            soup = BeautifulSoup(
+                html, self.tree_builder, parse_only=link_div)
 
         # * EXTRACTING BEGINS
-        title = soup.find("h1", class_="viewer-title").text
-        uploader = soup.find(
-            "span", class_="breadcrum-text float-left").text.strip()
-
-        # Image metadata
-        image_metadata = soup.find(
-            "a", class_="btn btn-download default")['title'].split("-")
-        temp = image_metadata[1].strip().split()
-        image_type = temp[0]
-        image_size = f"{temp[1]} {temp[2]}"
-        image_res = image_metadata[0].strip()
-
-        # Views and likes
-        views_likes_meta = soup.select(
-            "div.header div.header-content-right")[-1].text.strip().split("\n")
-        views = views_likes_meta[0].split()[0]
-        likes = views_likes_meta[1].strip()
-
-        # Image links storage
-        urls = [''] * 4
-        embed_codes = soup.select("div.panel-share div.panel-share-item")[0]
-        for index, code in enumerate(embed_codes.find_all("div", class_="panel-share-input-label copy-hover-display")):
-            urls[index] = code.input['value']
-
-        uploaded = soup.find(
-            "p", class_="description-meta margin-bottom-5").span.text
+        with self.stats.timer("extract", failed_phase="extract_failed"):
+            title = soup.find("h1", class_="viewer-title").text
+            uploader = soup.find(
+                "span", class_="breadcrum-text float-left").text.strip()
 
-        # Incase, User cancelled
-        if self.event.is_set():
-            return None
+            # Image metadata
+            image_metadata = soup.find(
+                "a", class_="btn btn-download default")['title'].split("-")
+            temp = image_metadata[1].strip().split()
+            image_type = temp[0]
+            image_size = f"{temp[1]} {temp[2]}"
+            image_res = image_metadata[0].strip()
+
+            # Views and likes
+            views_likes_meta = soup.select(
+                "div.header div.header-content-right")[-1].text.strip().split("\n")
+            views = views_likes_meta[0].split()[0]
+            likes = views_likes_meta[1].strip()
+
+            # Image links storage
+            urls = [''] * 4
+            embed_codes = soup.select("div.panel-share div.panel-share-item")[0]
+            for index, code in enumerate(embed_codes.find_all("div", class_="panel-share-input-label copy-hover-display")):
+                urls[index] = code.input['value']
+
+            uploaded = soup.find(
+                "p", class_="description-meta margin-bottom-5").span.text
 
         # ? Creating data dictionary & returning
         return {
@@ -212,3 +636,135 @@ class ImgPile:
             "uploader": uploader,
             "uploaded": uploaded
         }
+
+
+def _close_response(future):
+    """Closes the response of a finished (hedged) request"""
+    if future.exception() is None:
+        future.result().close()
+
+
+def _is_listing_tag(name, attrs):
+    """ 
+    ### Is Listing Tag
+    `SoupStrainer` filter that matches the pagination list & the images
+    container of a listing page.
+    """
+    if name == "div":
+        return attrs.get("id") == "content-listing-tabs"
+
+    if name == "ul":
+        classes = attrs.get("class") or ""
+        if isinstance(classes, str):
+            classes = classes.split()
+        return {"content-listing-pagination", "visible"}.issubset(classes)
+
+    return False
+
+
+# * FAST IMAGE PAGE EXTRACTOR
+# Patterns of the fixed set of fields on an image page
+_TITLE_RE = re.compile(
+    r'<h1[^>]*class=["\']viewer-title["\'][^>]*>(.*?)</h1>', re.S)
+_UPLOADER_RE = re.compile(
+    r'<span[^>]*class=["\']breadcrum-text float-left["\'][^>]*>(.*?)</span>', re.S)
+_DOWNLOAD_BUTTON_RE = re.compile(
+    r'<a[^>]*class=["\']btn btn-download default["\'][^>]*>', re.S)
+_HEADER_RIGHT_RE = re.compile(
+    r'<div[^>]*class=["\'][^"\']*\bheader-content-right\b[^"\']*["\'][^>]*>(.*?)</div>', re.S)
+_SHARE_ITEM_RE = re.compile(
+    r'<div[^>]*class=["\']panel-share-item["\'][^>]*>', re.S)
+_SHARE_INPUT_RE = re.compile(
+    r'<div[^>]*class=["\']panel-share-input-label copy-hover-display["\'][^>]*>.*?(<input[^>]*>)', re.S)
+_UPLOADED_RE = re.compile(
+    r'<p[^>]*class=["\']description-meta margin-bottom-5["\'][^>]*>.*?<span[^>]*>(.*?)</span>', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _text(markup: str):
+    """Returns the text of `markup` (tags stripped, entities unescaped)"""
+    return html_lib.unescape(_TAG_RE.sub("", markup))
+
+
+def _attr(tag: str, name: str):
+    """Returns the value of attribute `name` of a single `tag`"""
+    match = re.search(r'(?<![\w-])%s=(["\'])(.*?)\1' % name, tag, re.S)
+    if not match:
+        raise ValueError(f"attribute '{name}' not found")
+    return html_lib.unescape(match.group(2))
+
+
+def _search(pattern, html: str, pos: int = 0):
+    """Returns the match of `pattern` in `html` or raises `ValueError`"""
+    match = pattern.search(html, pos)
+    if not match:
+        raise ValueError(f"pattern '{pattern.pattern}' not found")
+    return match
+
+
+def fast_parse_image_data(html: str):
+    """ 
+    ### Fast Parse Image Data
+    Extracts the same image data as `ImgPile.soup_parse_image_data` with
+    targeted patterns, without building a tree of the page.
+
+    Raises `ValueError` if a field is not found where it is expected.
+    """
+    # Only look inside the content (like the tree parser does)
+    start = html.find('class="content-width"')
+    if start < 0:
+        raise ValueError("content not found")
+
+    # * EXTRACTING BEGINS
+    title = _text(_search(_TITLE_RE, html, start).group(1))
+    uploader = _text(_search(_UPLOADER_RE, html, start).group(1)).strip()
+
+    # Image metadata
+    image_metadata = _attr(
+        _search(_DOWNLOAD_BUTTON_RE, html, start).group(0), "title").split("-")
+    temp = image_metadata[1].strip().split()
+    if len(temp) < 3:
+        raise ValueError("image metadata not found")
+    image_type = temp[0]
+    image_size = f"{temp[1]} {temp[2]}"
+    image_res = image_metadata[0].strip()
+
+    # Views and likes (last block of the header)
+    headers = _HEADER_RIGHT_RE.findall(html, start)
+    if not headers:
+        raise ValueError("views & likes not found")
+    views_likes_meta = _text(headers[-1]).strip().split("\n")
+    if len(views_likes_meta) < 2:
+        raise ValueError("views & likes not found")
+    views = views_likes_meta[0].split()[0]
+    likes = views_likes_meta[1].strip()
+
+    # Image links storage (inputs of the first share item only)
+    urls = [''] * 4
+    item_start = _search(_SHARE_ITEM_RE, html, start).end()
+    next_item = _SHARE_ITEM_RE.search(html, item_start)
+    item_end = next_item.start() if next_item else len(html)
+    share_inputs = _SHARE_INPUT_RE.findall(html[item_start:item_end])
+    if not share_inputs:
+        raise ValueError("image links not found")
+    for index, tag in enumerate(share_inputs[:4]):
+        urls[index] = _attr(tag, "value")
+
+    uploaded = _text(_search(_UPLOADED_RE, html, start).group(1))
+
+    # ? Creating data dictionary & returning
+    return {
+        "image_url": urls[0],
+        "image_link": urls[1],
+        "lq_url": urls[3],
+        "thumb_url": urls[2],
+        "title": title,
+        "size": image_size,
+        "resolution": image_res,
+        "extension": f".{image_type.lower()}",
+        "image_type": image_type,
+        "views": views,
+        "likes": likes,
+        "uploader": uploader,
+        "uploaded": uploaded
+    }
@@ -0,0 +1,505 @@
+"""
+Persistent queue of album downloads
+
+Any number of albums can be queued at once. A single pool of `workers`
+threads drains the queue: every worker takes the next image of the first
+active job that still has images waiting, so while the last images of an
+album are in flight the next album already downloads.
+
+Jobs survive restarts (a job that was running continues on the next launch):
+
+```
+state_dir/
+    queue.json          the jobs (settings, state & counts) in queue order
+    <job id>.json       the scraped data of a job
+```
+
+What a job already downloaded is read from its folder's manifest (see
+`manifest.py`), so a continued job only downloads what is missing and an
+interrupted image resumes from its `.part` file.
+"""
+
+import os
+from os import path
+import json
+import uuid
+from collections import deque
+from threading import Condition, Event, Thread
+from time import monotonic, time
+from scheduler import POLICIES, TokenBucket
+
+# * Job states
+#   queued   waiting for a worker (planned on first use)
+#   running  images are downloading
+#   paused   held by the user, resumes where it stopped
+#   done     every image was tried (`failed` counts the ones that weren't saved)
+#   failed   couldn't be planned (see `error`)
+STATES = ("queued", "running", "paused", "done", "failed")
+ACTIVE = ("queued", "running")
+
+
+class DownloadJob:
+    """
+    ### Download Job
+    A queued album download: its settings, state & counts.
+    """
+
+    def __init__(self, job_id: str, save_path: str, image_quality: str = "High Quality",
+                 album: str = "", order: str = "order", pinned=(),
+                 bandwidth_limit: float = None, state: str = "queued", total: int = 0,
+                 completed: int = 0, failed: int = 0, added: float = None,
+                 finished: float = None, error: str = None):
+        self.id = job_id
+        self.save_path = save_path
+        self.image_quality = image_quality
+        self.album = album
+        self.order = order
+        self.pinned = list(pinned)
+        self.state = state
+        self.total = total
+        self.completed = completed
+        self.failed = failed
+        self.added = added or time()
+        self.finished = finished
+        self.error = error
+
+        # Set to stop the job's in-flight downloads (pause, remove & stop)
+        self.event = Event()
+        # Per-job bandwidth cap, counts the job's bytes too
+        self.bucket = TokenBucket(bandwidth_limit)
+
+        # Plan of the job (see `Backend.plan_downloads`), `work` is `None`
+        # until planned
+        self.manifest = None
+        self.allocator = None
+        self.work = None
+        self.planning = False
+        self.in_flight = 0
+
+        # Throughput: last sample (monotonic time, bytes) & its rate
+        self._sample = (monotonic(), 0)
+        self._rate = 0.0
+
+    @property
+    def bandwidth_limit(self):
+        return self.bucket.rate
+
+    def to_dict(self):
+        """Returns the persisted fields of the job"""
+        return {
+            "id": self.id,
+            "save_path": self.save_path,
+            "image_quality": self.image_quality,
+            "album": self.album,
+            "order": self.order,
+            "pinned": self.pinned,
+            "bandwidth_limit": self.bandwidth_limit,
+            "state": self.state,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "added": self.added,
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, fields: dict):
+        """Returns the job persisted as `fields` (see `to_dict`)"""
+        fields = dict(fields)
+        return cls(fields.pop("id"), **fields)
+
+    def throughput(self):
+        """Returns the bytes per second of the job (measured over >= 1 second)"""
+        if self.state != "running":
+            return 0.0
+
+        now = monotonic()
+        consumed = self.bucket.consumed
+        then, before = self._sample
+        if now - then >= 1.0:
+            self._rate = (consumed - before) / (now - then)
+            self._sample = (now, consumed)
+        return self._rate
+
+    def snapshot(self):
+        """Returns the job's fields, progress & throughput as a dictionary"""
+        return {
+            **self.to_dict(),
+            "pending": len(self.work) if self.work is not None else None,
+            "in_flight": self.in_flight,
+            "bytes": self.bucket.consumed,
+            "bytes_per_second": self.throughput(),
+        }
+
+
+class DownloadQueue:
+    """
+    ### Download Queue
+    Persistent queue of album downloads of `backend`, kept in `state_dir`
+    and drained by `workers` (default: `backend.download_workers`) threads.
+
+    ```
+    queue = DownloadQueue(backend).start()
+    job_id = queue.add(images, save_path)
+    queue.pause(job_id)
+    queue.resume(job_id)
+    ```
+
+    Listeners (see `add_listener`) are called as `listener(event, job=...)`
+    with the job's `snapshot()`: `"added"`, `"state"` on every change of
+    state, `"progress"` after every image & `"removed"`. They are called
+    from the worker threads.
+    """
+
+    INDEX = "queue.json"
+
+    def __init__(self, backend, state_dir: str = "downloads", workers: int = None):
+        self.backend = backend
+        self.state_dir = state_dir
+        self.workers = workers or backend.download_workers
+
+        self._cond = Condition()
+        self._stop = Event()
+        self._threads = []
+        self.listeners = []
+        # Jobs in queue order
+        self.jobs = []
+        self.load()
+
+    def load(self):
+        """
+        ### Load
+        Reads the persisted jobs, the interrupted ones are queued again.
+        """
+        index_path = path.join(self.state_dir, self.INDEX)
+        if not path.isfile(index_path):
+            return
+
+        try:
+            with open(index_path, encoding="utf-8") as index_file:
+                entries = json.load(index_file)
+        except (OSError, ValueError) as e:
+            print(e)
+            return
+
+        for fields in entries:
+            job = DownloadJob.from_dict(fields)
+            if job.state == "running":
+                job.state = "queued"
+            self.jobs.append(job)
+
+    def start(self):
+        """Starts the workers (queued jobs continue right away), returns `self`"""
+        self._stop.clear()
+        for _ in range(self.workers):
+            thread = Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """
+        ### Stop
+        Stops the workers (in-flight images are interrupted & kept for later)
+        and saves the queue. Running jobs continue on the next `start`.
+        """
+        with self._cond:
+            self._stop.set()
+            for job in self.jobs:
+                job.event.set()
+            self._cond.notify_all()
+
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+        with self._cond:
+            for job in self.jobs:
+                job.event = Event()
+            self._save()
+
+    def add(self, images: list, save_path: str, image_quality: str = "High Quality",
+            album: str = "", order: str = "order", pinned=(),
+            bandwidth_limit: float = None, paused: bool = False):
+        """
+        ### Add
+        Queues the download of `images` (scraped data) into `save_path` (see
+        `Backend.download_images` for the options), returns the job's id.
+        """
+        if not path.isdir(save_path):
+            raise ValueError(
+                "DownloadQueue.add(): `save_path` must be an existing directory")
+        if order not in POLICIES:
+            raise ValueError(f"Invalid Policy: order must be one of {', '.join(POLICIES)}.")
+
+        job = DownloadJob(uuid.uuid4().hex[:12], path.abspath(save_path), image_quality,
+                          album, order, pinned, bandwidth_limit,
+                          state="paused" if paused else "queued", total=len(images))
+        self._write_json(self._images_path(job.id), images)
+
+        with self._cond:
+            self.jobs.append(job)
+            self._save()
+            self._cond.notify_all()
+        self._notify("added", job)
+        return job.id
+
+    def get(self, job_id: str):
+        """Returns the snapshot of job `job_id` (`None` if there is none)"""
+        with self._cond:
+            job = self._find(job_id)
+            return job.snapshot() if job else None
+
+    def snapshot(self):
+        """Returns the snapshot of every job in queue order"""
+        with self._cond:
+            return [job.snapshot() for job in self.jobs]
+
+    def pause(self, job_id: str):
+        """Pauses job `job_id`, its in-flight images are interrupted & resumed later"""
+        with self._cond:
+            job = self._require(job_id)
+            if job.state not in ACTIVE:
+                return
+            job.state = "paused"
+            job.event.set()
+            self._save()
+        self._notify("state", job)
+
+    def resume(self, job_id: str):
+        """
+        ### Resume
+        Queues job `job_id` again: a paused job continues where it stopped, a
+        finished (or failed) job is planned again and retries what is missing.
+        """
+        with self._cond:
+            job = self._require(job_id)
+            if job.state in ACTIVE:
+                return
+            if job.state != "paused":
+                # Planned again, the complete images are skipped
+                job.work = None
+                job.error = None
+                job.finished = None
+            # A planned job goes on right away (planning starts it otherwise)
+            job.state = "queued" if job.work is None else "running"
+            job.event = Event()
+            self._check_done(job)
+            self._save()
+            self._cond.notify_all()
+        self._notify("state", job)
+
+    def remove(self, job_id: str):
+        """Removes job `job_id` from the queue (its in-flight images are interrupted)"""
+        with self._cond:
+            job = self._require(job_id)
+            job.event.set()
+            self.jobs.remove(job)
+            self._save()
+
+        try:
+            os.remove(self._images_path(job.id))
+        except OSError:
+            pass
+        self._notify("removed", job)
+
+    def move(self, job_id: str, position: int):
+        """Moves job `job_id` to `position` in the queue (`0` is downloaded first)"""
+        with self._cond:
+            job = self._require(job_id)
+            self.jobs.remove(job)
+            self.jobs.insert(max(0, position), job)
+            self._save()
+
+    def set_bandwidth_limit(self, job_id: str, bandwidth_limit: float = None):
+        """Caps job `job_id` to `bandwidth_limit` bytes per second (`None`: no cap)"""
+        with self._cond:
+            self._require(job_id).bucket.rate = bandwidth_limit
+            self._save()
+
+    def pending(self):
+        """Returns the number of planned images waiting for a worker"""
+        with self._cond:
+            return sum(len(job.work) for job in self.jobs
+                       if job.state in ACTIVE and job.work is not None)
+
+    def wait(self, timeout: float = None):
+        """
+        ### Wait
+        Waits until no job is queued or running (at most `timeout` seconds),
+        returns whether the queue is idle.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not any(job.state in ACTIVE for job in self.jobs), timeout)
+
+    def add_listener(self, listener):
+        """Calls `listener(event, job=snapshot)` on every change of a job"""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Stops calling `listener`"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _work(self):
+        """Worker: downloads the images of the active jobs until stopped"""
+        while True:
+            with self._cond:
+                taken = self._take()
+            if taken is None:
+                return
+
+            job, item, event = taken
+            if item is None:
+                self._plan(job)
+                continue
+
+            try:
+                done = self.backend._download_planned(
+                    job.manifest, job.allocator, item[0], item[1], job.save_path,
+                    event, job.bucket)
+            except Exception as e:
+                print(e)
+                done = False
+            self._finish(job, item, event, done)
+
+    def _take(self):
+        """
+        Returns the next `(job, (image url, filename), event)` of the first
+        active job with images waiting, `(job, None, event)` if a job has to
+        be planned first or `None` once stopped (call it holding the lock).
+        """
+        while not self._stop.is_set():
+            for job in self.jobs:
+                if job.state not in ACTIVE:
+                    continue
+
+                if job.work is None:
+                    if job.planning:
+                        continue
+                    job.planning = True
+                    return job, None, job.event
+
+                if job.work:
+                    job.state = "running"
+                    job.in_flight += 1
+                    return job, job.work.popleft(), job.event
+
+            self._cond.wait()
+        return None
+
+    def _plan(self, job: DownloadJob):
+        """Plans `job` from its scraped data & its folder's manifest"""
+        try:
+            images = self._read_json(self._images_path(job.id))
+            manifest, allocator, work, skipped = self.backend.plan_downloads(
+                images, job.image_quality, job.save_path, job.album, job.order, job.pinned)
+        except Exception as e:
+            print(e)
+            with self._cond:
+                job.planning = False
+                job.state = "failed"
+                job.error = str(e)
+                self._save()
+                self._cond.notify_all()
+            self._notify("state", job)
+            return
+
+        with self._cond:
+            job.planning = False
+            job.manifest = manifest
+            job.allocator = allocator
+            job.work = deque(work)
+            job.total = len(images)
+            job.completed = skipped
+            job.failed = 0
+            if job.state == "queued":
+                job.state = "running"
+            self._check_done(job)
+            self._save()
+            self._cond.notify_all()
+        self._notify("state", job)
+
+    def _finish(self, job: DownloadJob, item: tuple, event, done: bool):
+        """Counts the image `item` of `job` as done, failed or back in line"""
+        with self._cond:
+            job.in_flight -= 1
+            if done:
+                job.completed += 1
+            elif event.is_set():
+                # Paused, removed or stopped: downloaded (resumed) later
+                job.work.appendleft(item)
+            else:
+                job.failed += 1
+
+            finished = self._check_done(job)
+            if finished:
+                self._save()
+            self._cond.notify_all()
+
+        self._notify("state" if finished else "progress", job)
+
+    def _check_done(self, job: DownloadJob):
+        """Marks `job` done once every image was tried, returns whether it did"""
+        if job.state in ACTIVE and job.work is not None and \
+                not job.work and not job.in_flight:
+            job.state = "done"
+            job.finished = time()
+            return True
+        return False
+
+    def _notify(self, event: str, job: DownloadJob):
+        """Calls the listeners with the snapshot of `job`"""
+        if not self.listeners:
+            return
+        with self._cond:
+            if event != "removed" and job not in self.jobs:
+                return
+            snapshot = job.snapshot()
+        for listener in list(self.listeners):
+            try:
+                listener(event, job=snapshot)
+            except Exception as e:
+                print(e)
+
+    def _find(self, job_id: str):
+        for job in self.jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def _require(self, job_id: str):
+        job = self._find(job_id)
+        if job is None:
+            raise KeyError(f"No download job '{job_id}'")
+        return job
+
+    def _images_path(self, job_id: str):
+        return path.join(self.state_dir, f"{job_id}.json")
+
+    def _save(self):
+        """Writes the jobs to the index (call it holding the lock)"""
+        try:
+            self._write_json(path.join(self.state_dir, self.INDEX),
+                             [job.to_dict() for job in self.jobs])
+        except OSError as e:
+            print(e)
+
+    def _write_json(self, filepath: str, data):
+        """Writes `data` as json to `filepath` atomically"""
+        if not path.isdir(self.state_dir):
+            os.makedirs(self.state_dir)
+
+        temp_path = f"{filepath}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as jsonfile:
+            json.dump(data, jsonfile)
+            jsonfile.flush()
+            os.fsync(jsonfile.fileno())
+        os.replace(temp_path, filepath)
+
+    @staticmethod
+    def _read_json(filepath: str):
+        with open(filepath, encoding="utf-8") as jsonfile:
+            return json.load(jsonfile)
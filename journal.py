@@ -0,0 +1,166 @@
+"""
+Crash-safe checkpoint journal of a crawl
+
+An append-only JSON-lines file recording every listing page (with its image
+links & next page) and every extracted image, so an interrupted crawl can
+resume where it stopped instead of starting over.
+
+```
+{"page": "<url>", "links": ["<image link>", ...], "next": "<url>"}
+{"link": "<image link>", "data": {...image data...}}
+```
+"""
+
+import os
+from os import path
+import json
+import hashlib
+from threading import Lock
+from time import monotonic
+
+
+class CrawlJournal:
+    """
+    ### Crawl Journal
+    Append-only journal of the crawl of a single album.
+
+    Entries are buffered and written (and synced to disk) in batches of
+    `flush_every` entries or every `flush_interval` seconds, whichever comes
+    first. A torn last line (crash while writing) is ignored on load.
+    """
+
+    def __init__(self, filepath: str, flush_every: int = 50, flush_interval: float = 2.0):
+        self.filepath = filepath
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        # Listing pages: page url > {"links": [...], "next": next page url}
+        self.pages = {}
+        # Extracted images: image link > image data
+        self.records = {}
+        self.load()
+
+        self._lock = Lock()
+        self._buffer = []
+        self._last_flush = monotonic()
+        self._file = None
+
+    @classmethod
+    def for_url(cls, journal_dir: str, url: str, **kwargs):
+        """
+        ### For URL
+        Returns the journal of album `url` in `journal_dir`.
+        """
+        if not path.isdir(journal_dir):
+            os.makedirs(journal_dir)
+
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return cls(path.join(journal_dir, f"{key}.jsonl"), **kwargs)
+
+    def load(self):
+        """
+        ### Load
+        Reads the entries already in the journal file (if any).
+        """
+        if not path.isfile(self.filepath):
+            return
+
+        # Bytes of the file holding complete entries
+        good_size = 0
+        with open(self.filepath, "rb") as journal:
+            for line in journal:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn entry")
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write, everything after it is lost anyway
+                    break
+
+                good_size += len(line)
+                if "page" in entry:
+                    self.pages[entry['page']] = {"links": entry['links'],
+                                                 "next": entry['next']}
+                elif "link" in entry:
+                    self.records[entry['link']] = entry['data']
+
+        # Cut the torn entry off, so new entries start on a fresh line
+        if path.getsize(self.filepath) > good_size:
+            with open(self.filepath, "r+b") as journal:
+                journal.truncate(good_size)
+
+    def resume_listing(self, start_page: str):
+        """
+        ### Resume Listing
+        Follows the journaled listing pages from `start_page` and returns a
+        tuple of `(image links found so far, page to continue from, visited
+        pages)`. The page to continue from is empty if the listing is complete.
+        """
+        links = []
+        visited = set()
+
+        page = start_page
+        while page in self.pages and page not in visited:
+            visited.add(page)
+            links.extend(self.pages[page]['links'])
+            page = self.pages[page]['next']
+
+        return links, page, visited
+
+    def listing_complete(self, start_page: str):
+        """Returns whether the journaled listing of `start_page` reached its last page"""
+        return not self.resume_listing(start_page)[1]
+
+    def page(self, page: str, links: list, next_page: str):
+        """Journals a listing `page` with its image `links` & `next_page`"""
+        self.pages[page] = {"links": links, "next": next_page}
+        self._append({"page": page, "links": links, "next": next_page})
+
+    def record(self, link: str, data: dict):
+        """Journals the extracted `data` of image `link`"""
+        self.records[link] = data
+        self._append({"link": link, "data": data})
+
+    def flush(self):
+        """
+        ### Flush
+        Writes the buffered entries to the journal file and syncs it to disk.
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        """Flushes & closes the journal file (the journal is kept for resuming)"""
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def delete(self):
+        """Closes & deletes the journal (the crawl is complete)"""
+        self.close()
+        if path.isfile(self.filepath):
+            os.remove(self.filepath)
+
+    def _append(self, entry: dict):
+        """Buffers `entry`, flushing the buffer when it is due"""
+        with self._lock:
+            self._buffer.append(json.dumps(entry))
+            if len(self._buffer) >= self.flush_every or \
+                    monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        """Writes the buffered entries (lock must be held)"""
+        self._last_flush = monotonic()
+        if not self._buffer:
+            return
+
+        if self._file is None:
+            self._file = open(self.filepath, "a", encoding="utf-8")
+
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._buffer = []
@@ -0,0 +1,172 @@
+"""
+SQLite manifest of the downloads into a folder
+
+Every destination folder holds a `.imgcrawler.sqlite3` manifest with a row per
+image url: the file it was saved as, its byte length & digest and whether it
+is complete. A download run plans its work from a single query instead of
+probing the folder file by file, and a file is only ever trusted once its row
+says it is complete.
+"""
+
+import sqlite3
+from os import path
+from threading import Lock
+from time import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    url         TEXT PRIMARY KEY,
+    filename    TEXT UNIQUE,
+    album       TEXT NOT NULL DEFAULT '',
+    length      INTEGER,
+    digest      TEXT,
+    state       TEXT NOT NULL DEFAULT 'pending',
+    updated_at  REAL
+);
+CREATE INDEX IF NOT EXISTS downloads_album_state ON downloads (album, state);
+"""
+
+
+class DownloadManifest:
+    """
+    ### Download Manifest
+    Manifest of the downloads into `save_path` (thread-safe).
+
+    ```
+    state = "pending"   planned, maybe partially downloaded
+            "complete"  the file is whole (`length` bytes, `digest`)
+    ```
+    """
+
+    FILENAME = ".imgcrawler.sqlite3"
+
+    def __init__(self, save_path: str):
+        self.save_path = save_path
+        self.filepath = path.join(save_path, self.FILENAME)
+
+        self._lock = Lock()
+        self._db = sqlite3.connect(self.filepath, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    def plan(self, urls: list, album: str = ""):
+        """
+        ### Plan
+        Adds the (new) `urls` of `album` as pending and returns a dictionary
+        of `url > filename` of the ones already complete.
+        """
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO downloads (url, album, updated_at) VALUES (?, ?, ?)",
+                [(url, album, time()) for url in urls])
+            return dict(self._db.execute(
+                "SELECT url, filename FROM downloads WHERE state = 'complete'"))
+
+    def claim(self, url: str, filename: str):
+        """
+        ### Claim
+        Reserves `filename` for `url`, returns `False` if another url holds it.
+        """
+        with self._lock, self._db:
+            try:
+                self._db.execute(
+                    "INSERT INTO downloads (url, filename, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (url) DO UPDATE SET filename = excluded.filename, "
+                    "updated_at = excluded.updated_at",
+                    (url, filename, time()))
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def filename(self, url: str):
+        """Returns the filename reserved for `url` (or `None`)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT filename FROM downloads WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def filenames(self):
+        """Returns every reserved filename"""
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                "SELECT filename FROM downloads WHERE filename IS NOT NULL")]
+
+    def complete(self, url: str, filename: str, length: int, digest: str = None):
+        """Marks the download of `url` as complete"""
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE downloads SET filename = ?, length = ?, digest = ?, "
+                "state = 'complete', updated_at = ? WHERE url = ?",
+                (filename, length, digest, time(), url))
+
+    def missing(self, album: str = None):
+        """
+        ### Missing
+        Returns the rows (`url, filename, state`) that are not complete, of
+        `album` only if given.
+        """
+        query = "SELECT url, filename, state FROM downloads WHERE state != 'complete'"
+        params = ()
+        if album is not None:
+            query += " AND album = ?"
+            params = (album,)
+
+        with self._lock:
+            return [{"url": url, "filename": filename, "state": state}
+                    for url, filename, state in self._db.execute(query, params)]
+
+    def summary(self, album: str = None):
+        """
+        ### Summary
+        Returns the number of complete & pending images (and complete bytes),
+        of `album` only if given.
+        """
+        query = "SELECT state, COUNT(*), COALESCE(SUM(length), 0) FROM downloads"
+        params = ()
+        if album is not None:
+            query += " WHERE album = ?"
+            params = (album,)
+
+        with self._lock:
+            rows = self._db.execute(query + " GROUP BY state", params).fetchall()
+
+        summary = {"complete": 0, "pending": 0, "bytes": 0}
+        for state, count, length in rows:
+            summary[state] = count
+            if state == "complete":
+                summary['bytes'] = length
+        return summary
+
+    def verify(self):
+        """
+        ### Verify
+        Checks the complete files against the disk (one stat each) and marks
+        the missing or truncated ones as pending again. Returns their urls.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT url, filename, length FROM downloads WHERE state = 'complete'"
+            ).fetchall()
+
+        broken = []
+        for url, filename, length in rows:
+            filepath = path.join(self.save_path, filename or "")
+            if not path.isfile(filepath) or \
+                    (length is not None and path.getsize(filepath) != length):
+                broken.append(url)
+
+        self.reopen(broken)
+        return broken
+
+    def reopen(self, urls: list):
+        """Marks the downloads of `urls` as pending again (their filenames stay reserved)"""
+        with self._lock, self._db:
+            self._db.executemany(
+                "UPDATE downloads SET state = 'pending', updated_at = ? WHERE url = ?",
+                [(time(), url) for url in urls])
+
+    def close(self):
+        """Closes the manifest database"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,241 @@
+"""
+Metrics export of long-running scrapes & downloads
+
+`MetricsExporter` samples a `Backend` every `interval` seconds in a daemon
+thread, never in the Tk main loop or a worker, and
+
+- serves the latest sample over HTTP (`GET /metrics` in the Prometheus text
+  format, `GET /metrics.json` as JSON) if a `port` is given,
+- (re)writes it as JSON to `dump_path` if one is given.
+
+```
+exporter = backend.start_metrics(port=9100, dump_path="metrics.json")
+...
+backend.stop_metrics()
+```
+"""
+
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from time import monotonic, time
+
+
+class MetricsExporter:
+    """
+    ### Metrics Exporter
+    Samples the metrics of `backend` every `interval` seconds, serves them on
+    `host:port` (if `port`) and dumps them to `dump_path` (if given).
+
+    Rates (per second) are measured over the last interval.
+    """
+
+    def __init__(self, backend, port: int = None, host: str = "127.0.0.1",
+                 dump_path: str = None, interval: float = 10.0):
+        self.backend = backend
+        self.port = port
+        self.host = host
+        self.dump_path = dump_path
+        self.interval = interval
+
+        self._lock = Lock()
+        self._stop = Event()
+        self._thread = None
+        self._server = None
+        # Latest sample & the counters it was computed from
+        self.latest = None
+        self._previous = None
+
+    def start(self):
+        """Starts sampling (and serving), returns `self`"""
+        self.sample()
+
+        self._thread = Thread(target=self._sample_forever, daemon=True)
+        self._thread.start()
+
+        if self.port is not None:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+            self._server.daemon_threads = True
+            # Port 0 picks a free port
+            self.port = self._server.server_address[1]
+            Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stops sampling & serving (the last sample is dumped once more)"""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.sample()
+
+    def sample(self):
+        """
+        ### Sample
+        Collects the metrics, keeps them as `self.latest` and dumps them.
+        """
+        metrics = self.collect()
+        with self._lock:
+            self.latest = metrics
+
+        if self.dump_path:
+            try:
+                self._dump(metrics)
+            except OSError as e:
+                print(e)
+        return metrics
+
+    def collect(self):
+        """
+        ### Collect
+        Returns the current metrics of the backend as a dictionary.
+        """
+        backend = self.backend
+        scrape = backend.stats.snapshot()['counters']
+        download = backend.download_stats.snapshot()['counters']
+        hosts = backend.get_rate_limit_stats()
+        now = monotonic()
+
+        counters = {
+            "pages": scrape.get("listing_pages", 0) + scrape.get("image_pages", 0),
+            "images": scrape.get("images", 0),
+            "scraped_bytes": scrape.get("scraped_bytes", 0),
+            "downloaded_images": download.get("images", 0),
+            "downloaded_bytes": download.get("downloaded_bytes", 0),
+        }
+        rates = self._rates(now, counters)
+
+        apis = [backend.img_api]
+        if backend.async_img_api is not None:
+            apis.append(backend.async_img_api)
+
+        return {
+            "time": time(),
+            "requests_in_flight": sum(host['in_flight'] for host in hosts.values()),
+            "scrape": {
+                "running": backend.stats.finished is None,
+                "pages": counters['pages'],
+                "images": counters['images'],
+                "failed_images": scrape.get("failed_images", 0),
+                "pages_per_second": rates['pages'],
+                "images_per_second": rates['images'],
+                "bytes_per_second": rates['scraped_bytes'],
+            },
+            "download": {
+                "images": counters['downloaded_images'],
+                "bytes": counters['downloaded_bytes'],
+                "images_per_second": rates['downloaded_images'],
+                "bytes_per_second": rates['downloaded_bytes'],
+            },
+            "retries": {
+                "total": backend.img_api.retry.retries,
+                "budget_left": backend.img_api.retry.budget_left,
+                "hedges": backend.img_api.hedges,
+                "host_errors": sum(host['errors'] for host in hosts.values()),
+            },
+            "cache": backend.cache.stats() if backend.cache is not None else None,
+            "queues": {
+                "scrape": sum(api.queue_depth() for api in apis),
+                "download": backend.download_queue_depth(),
+            },
+            "hosts": {name: {"limit": host['limit'], "in_flight": host['in_flight'],
+                             "errors": host['errors']}
+                      for name, host in hosts.items()},
+        }
+
+    def prometheus(self, metrics: dict = None):
+        """
+        ### Prometheus
+        Returns `metrics` (default: the latest sample) in the Prometheus text
+        format, every number becomes an `imgcrawler_...` gauge.
+        """
+        if metrics is None:
+            with self._lock:
+                metrics = self.latest
+
+        lines = []
+        hosts = metrics.get("hosts", {})
+        for name, value in _flatten({key: value for key, value in metrics.items()
+                                     if key != "hosts"}):
+            lines.append(f"imgcrawler_{name} {value}")
+
+        for host, values in hosts.items():
+            for name, value in values.items():
+                lines.append(f'imgcrawler_host_{name}{{host="{host}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def _rates(self, now: float, counters: dict):
+        """Returns the per second rate of every counter since the last sample"""
+        previous = self._previous
+        self._previous = (now, counters)
+        if previous is None or now <= previous[0]:
+            return {name: 0.0 for name in counters}
+
+        seconds = now - previous[0]
+        rates = {}
+        for name, value in counters.items():
+            old = previous[1][name]
+            # A new scrape resets the counters, count from zero then
+            rates[name] = (value - old if value >= old else value) / seconds
+        return rates
+
+    def _sample_forever(self):
+        """Samples every `self.interval` seconds until stopped"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(e)
+
+    def _dump(self, metrics: dict):
+        """Writes `metrics` to `self.dump_path` atomically"""
+        temp_path = f"{self.dump_path}.tmp"
+        with open(temp_path, "w") as jsonfile:
+            json.dump(metrics, jsonfile, indent=4)
+        os.replace(temp_path, self.dump_path)
+
+    def _handler(self):
+        """Returns the request handler class bound to this exporter"""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with exporter._lock:
+                    metrics = exporter.latest
+
+                if self.path == "/metrics":
+                    body = exporter.prometheus(metrics).encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_):
+                # Scrapes of the endpoint are not worth a line each
+                pass
+
+        return Handler
+
+
+def _flatten(metrics: dict, prefix: str = ""):
+    """Yields `(name, number)` of every number in the nested `metrics`"""
+    for key, value in metrics.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        elif isinstance(value, bool):
+            yield name, int(value)
+        elif isinstance(value, (int, float)):
+            yield name, value
@@ -0,0 +1,266 @@
+"""
+Adaptive per-host concurrency control (AIMD) shared by the scraper & downloader
+
+Each host starts with a small concurrency limit. Every healthy response raises
+it additively (about +1 per round of `limit` responses), while a `429`/`503`,
+a timeout, a connection error or a latency spike cuts it multiplicatively.
+`Retry-After` pauses the host for as long as the server asks.
+"""
+
+from collections import deque
+from email.utils import parsedate_to_datetime
+from threading import Condition
+from time import monotonic, time
+from urllib.parse import urlparse
+from requests.exceptions import ConnectionError, Timeout
+
+
+class RequestCancelled(Exception):
+    """Raised when the user cancels while a request waits for its slot"""
+
+
+class _HostState:
+    """Limits, counters & decisions of a single host"""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        # Host is paused (Retry-After) until this monotonic time
+        self.paused_until = 0.0
+        # Smoothed latency of healthy responses (seconds)
+        self.latency = None
+        self.last_decrease = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.increases = 0
+        self.decreases = 0
+        # Latest decisions: (unix time, reason, old limit, new limit)
+        self.decisions = deque(maxlen=20)
+
+
+class _Slot:
+    """
+    ### Slot
+    A request's place in its host's concurrency limit (see `AdaptiveLimiter.slot`)
+    """
+
+    def __init__(self, limiter, host: str):
+        self.limiter = limiter
+        self.host = host
+        self.started = monotonic()
+        self.recorded = False
+
+    def done(self, response):
+        """
+        ### Done
+        Records the outcome of the request (call it as soon as the response
+        headers arrived, before reading a large body).
+        """
+        self.recorded = True
+        self.limiter.record(self.host, monotonic() - self.started,
+                            status=response.status_code,
+                            retry_after=response.headers.get("Retry-After"))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if not self.recorded:
+            if exc_type is not None and issubclass(exc_type, (Timeout, ConnectionError)):
+                self.limiter.record(self.host, monotonic() - self.started,
+                                    error=exc)
+            elif exc_type is None:
+                self.limiter.record(self.host, monotonic() - self.started)
+
+        self.limiter.release(self.host)
+        return False
+
+
+class AdaptiveLimiter:
+    """
+    ### Adaptive Limiter
+    Additive-increase/multiplicative-decrease concurrency limiter per host.
+
+    ```
+    initial          = starting limit of every host
+    minimum/maximum  = bounds of the limit
+    increase         = limit gained per round of healthy responses
+    decrease         = factor the limit is multiplied by on trouble
+    latency_factor   = a response slower than `latency_factor` x the smoothed
+                       latency counts as a spike
+    max_retry_after  = longest pause honored from a `Retry-After` header
+    ```
+
+    ```
+    with limiter.slot(url, event) as slot:
+        response = session.get(url, stream=True)
+        slot.done(response)
+        ...read the body...
+    ```
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 16,
+                 increase: float = 1.0, decrease: float = 0.5,
+                 latency_factor: float = 3.0, max_retry_after: float = 120):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.max_retry_after = max_retry_after
+
+        self._hosts = {}
+        self._condition = Condition()
+
+    def slot(self, url: str, event=None):
+        """
+        ### Slot
+        Waits until `url`'s host has room for one more request and returns a
+        context manager holding that room.
+
+        Raises `RequestCancelled` if `event` is set while waiting.
+        """
+        host = urlparse(url).netloc
+        self.acquire(host, event)
+        return _Slot(self, host)
+
+    def has_room(self, url: str):
+        """
+        ### Has Room
+        Returns `True` if `url`'s host would take one more request right now
+        (below its limit & not paused).
+        """
+        host = urlparse(url).netloc
+        with self._condition:
+            state = self._state(host)
+            return state.paused_until <= monotonic() and \
+                state.in_flight < int(state.limit)
+
+    def acquire(self, host: str, event=None):
+        """
+        ### Acquire
+        Blocks until `host` is below its limit (and not paused).
+        """
+        with self._condition:
+            state = self._state(host)
+            while True:
+                if event is not None and event.is_set():
+                    raise RequestCancelled(host)
+
+                paused_for = state.paused_until - monotonic()
+                if paused_for <= 0 and state.in_flight < int(state.limit):
+                    break
+
+                # Wake up regularly to notice cancellation & the pause ending
+                self._condition.wait(0.1)
+
+            state.in_flight += 1
+            state.requests += 1
+
+    def release(self, host: str):
+        """
+        ### Release
+        Frees a request's room in `host`'s limit.
+        """
+        with self._condition:
+            self._state(host).in_flight -= 1
+            self._condition.notify_all()
+
+    def record(self, host: str, latency: float, status: int = None,
+               error: Exception = None, retry_after: str = None):
+        """
+        ### Record
+        Adjusts `host`'s limit from the outcome of a request.
+        """
+        with self._condition:
+            state = self._state(host)
+            now = monotonic()
+
+            # * Trouble > multiplicative decrease
+            reason = None
+            if error is not None:
+                state.errors += 1
+                reason = type(error).__name__
+            elif status in (429, 503):
+                state.errors += 1
+                reason = f"HTTP {status}"
+            else:
+                if state.latency is not None and latency > self.latency_factor * state.latency:
+                    reason = f"latency spike ({latency:.2f}s)"
+                # ? Spikes are smoothed in too, a host that got slower for
+                # ? good becomes the new normal instead of a spike forever
+                if state.latency is None:
+                    state.latency = latency
+                else:
+                    state.latency = 0.8 * state.latency + 0.2 * latency
+
+            if status in (429, 503) and retry_after:
+                pause = min(self._parse_retry_after(retry_after),
+                            self.max_retry_after)
+                state.paused_until = max(state.paused_until, now + pause)
+                self._decide(state, f"Retry-After {pause:.0f}s",
+                             state.limit, state.limit)
+
+            if reason:
+                # Only once per round trip, one bad burst is a single signal
+                if now - state.last_decrease > (state.latency or 1.0):
+                    state.last_decrease = now
+                    state.decreases += 1
+                    self._decide(state, reason, state.limit,
+                                 max(self.minimum, state.limit * self.decrease))
+                self._condition.notify_all()
+                return
+
+            # * Healthy > additive increase (+`increase` per round of `limit`)
+            new_limit = min(self.maximum,
+                            state.limit + self.increase / state.limit)
+            if int(new_limit) > int(state.limit):
+                state.increases += 1
+                self._decide(state, "healthy", state.limit, new_limit)
+            state.limit = new_limit
+            self._condition.notify_all()
+
+    def stats(self):
+        """
+        ### Stats
+        Returns the current limits, counters and latest decisions of every host.
+        """
+        with self._condition:
+            now = monotonic()
+            return {host: {
+                "limit": int(state.limit),
+                "in_flight": state.in_flight,
+                "latency": state.latency,
+                "paused_for": max(0.0, state.paused_until - now),
+                "requests": state.requests,
+                "errors": state.errors,
+                "increases": state.increases,
+                "decreases": state.decreases,
+                "decisions": list(state.decisions),
+            } for host, state in self._hosts.items()}
+
+    def _decide(self, state: _HostState, reason: str, old: float, new: float):
+        """Applies & logs a limit decision"""
+        state.limit = new
+        state.decisions.append((time(), reason, int(old), int(new)))
+
+    def _state(self, host: str):
+        """Returns the state of `host` (created on first use)"""
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(
+                float(min(self.initial, self.maximum)))
+        return self._hosts[host]
+
+    @staticmethod
+    def _parse_retry_after(value: str):
+        """Returns the seconds of a `Retry-After` header (seconds or HTTP date)"""
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+        except (TypeError, ValueError):
+            return 0.0
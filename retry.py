@@ -0,0 +1,147 @@
+"""
+Retry policy (jittered exponential backoff with a retry budget) & latency tracking
+used by the scraper to retry failed requests and to hedge slow ones.
+"""
+
+import random
+from collections import deque
+from threading import Lock
+from time import sleep
+from requests.exceptions import ChunkedEncodingError, ConnectionError, Timeout
+
+
+class RetryPolicy:
+    """
+    ### Retry Policy
+    Retries a request on retryable errors with "full jitter" exponential backoff.
+
+    ```
+    max_attempts     = attempts per request (first one included)
+    base_delay       = backoff of the first retry (seconds), doubled every retry
+    max_delay        = longest backoff (seconds)
+    budget           = retries allowed per crawl (see `reset_budget`)
+    retry_statuses   = HTTP statuses worth retrying
+    ```
+
+    Timeouts, connection errors & broken transfers are retryable, anything
+    else (invalid urls, cancellation...) fails straight away.
+    """
+
+    RETRYABLE_ERRORS = (Timeout, ConnectionError, ChunkedEncodingError)
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 20.0, budget: int = 200,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retry_statuses = retry_statuses
+
+        self._lock = Lock()
+        # Retries left in this crawl's budget
+        self.budget_left = budget
+        # Total number of retries (not reset with the budget)
+        self.retries = 0
+
+    def reset_budget(self):
+        """
+        ### Reset Budget
+        Refills the retry budget (call it at the start of every crawl).
+        """
+        with self._lock:
+            self.budget_left = self.budget
+
+    def is_retryable(self, error: Exception = None, status: int = None):
+        """
+        ### Is Retryable
+        Returns `True` if a request that failed with `error` or answered
+        with `status` is worth retrying.
+        """
+        if error is not None:
+            return isinstance(error, self.RETRYABLE_ERRORS)
+        return status in self.retry_statuses
+
+    def backoff(self, attempt: int):
+        """
+        ### Backoff
+        Returns the (jittered) seconds to wait before retry number `attempt`.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, send, event=None):
+        """
+        ### Call
+        Calls `send()` (which returns a response) and retries it according to
+        the policy. The last response is returned (or the last error raised)
+        once attempts or the budget run out.
+
+        Backoff sleeps end early if `event` is set.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = send()
+                retryable = self.is_retryable(status=response.status_code)
+                error = None
+            except Exception as e:
+                response = None
+                retryable = self.is_retryable(error=e)
+                error = e
+
+            attempt += 1
+            cancelled = event is not None and event.is_set()
+            if not retryable or cancelled or attempt >= self.max_attempts or not self.spend():
+                if error is not None:
+                    raise error
+                return response
+
+            # Release the connection of a failed response before retrying
+            if response is not None:
+                response.close()
+
+            delay = self.backoff(attempt - 1)
+            if event is not None:
+                event.wait(delay)
+            else:
+                sleep(delay)
+
+    def spend(self):
+        """Takes a retry from the budget, returns `False` if it is empty"""
+        with self._lock:
+            if self.budget_left <= 0:
+                return False
+            self.budget_left -= 1
+            self.retries += 1
+            return True
+
+
+class LatencyTracker:
+    """
+    ### Latency Tracker
+    Keeps the latest `window` latencies and returns their percentiles.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = Lock()
+
+    def add(self, seconds: float):
+        """Records a latency (in seconds)"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percent: float):
+        """
+        ### Percentile
+        Returns the `percent`th percentile latency, or `None` until there are
+        at least `min_samples` latencies.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100))
+        return latencies[index]
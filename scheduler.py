@@ -0,0 +1,103 @@
+"""
+Download order & bandwidth caps
+
+Every scraped image carries its `size` ("32.2 MB"), so the work of a download
+can be ordered before it starts:
+
+```
+"order"     as scraped (list order)
+"smallest"  smallest first, many images finish early (fast visible progress)
+"largest"   largest first, the big transfers keep the link busy while the
+            small ones fill the gaps at the end
+```
+
+Pinned images always go first (in the order they were pinned), the policy
+orders the rest.
+
+Bandwidth is capped with token buckets: one shared by every download of a
+`Backend` (global cap) and one per `download_images` run (per-job cap). A
+chunk is only read on once every bucket it goes through has the bytes for it.
+"""
+
+from threading import Lock
+from time import monotonic, sleep
+from ratelimit import RequestCancelled
+
+POLICIES = ("order", "smallest", "largest")
+
+
+def order_downloads(work: list, policy: str = "order", pinned=()):
+    """
+    ### Order Downloads
+    Returns `work` (a list of `(size in bytes, key, item)`) ordered by
+    `policy`, the items whose `key` is in `pinned` first.
+
+    Images of unknown size (`0`) go last with `"largest"` and first with
+    `"smallest"`, the order among equal sizes is kept.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Invalid Policy: policy must be one of {', '.join(POLICIES)}.")
+
+    # Pinned key > its rank
+    pins = {key: rank for rank, key in enumerate(pinned)}
+    unpinned = len(pins)
+
+    def sort_key(entry):
+        index, (size, key, _) = entry
+        rank = pins.get(key, unpinned)
+        if policy == "smallest":
+            return rank, size, index
+        if policy == "largest":
+            return rank, -size, index
+        return rank, index
+
+    return [entry for _, entry in sorted(enumerate(work), key=sort_key)]
+
+
+class TokenBucket:
+    """
+    ### Token Bucket
+    Caps a flow of bytes to `rate` bytes per second (thread-safe), `burst`
+    bytes (default: one second worth) may go through at once after a pause.
+
+    `rate` can be changed at any time, `None` (or `0`) lifts the cap.
+    `consumed` counts every byte that went through (capped or not).
+    """
+
+    def __init__(self, rate: float = None, burst: float = None):
+        self.rate = rate
+        self.burst = burst
+        self.consumed = 0
+        self._tokens = 0.0
+        self._updated = monotonic()
+        self._lock = Lock()
+
+    def consume(self, amount: int, event=None):
+        """
+        ### Consume
+        Takes `amount` bytes out of the bucket, waits until the bucket had
+        them. Raises `RequestCancelled` as soon as `event` is set.
+
+        Callers never wait for each other: a take larger than the bucket
+        goes into debt, the next ones wait for it to be paid back.
+        """
+        with self._lock:
+            self.consumed += amount
+            rate = self.rate
+            now = monotonic()
+            if not rate:
+                self._tokens = 0.0
+                self._updated = now
+                return
+
+            burst = self.burst or rate
+            self._tokens = min(burst, self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = -self._tokens / rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            if event is None:
+                sleep(wait)
+            elif event.wait(wait):
+                raise RequestCancelled("cancelled while throttled")
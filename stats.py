@@ -0,0 +1,211 @@
+"""
+Per-phase timing & counters of the scraper and the downloader
+
+Every request is split in phases, each phase is timed and aggregated in a
+histogram (log-scale buckets, so memory stays constant however long the run):
+
+```
+connect    DNS lookup, TCP & TLS handshake of a new connection (part of ttfb,
+           only recorded for requests that opened a connection)
+ttfb       request sent > response headers received (connect included)
+transfer   response headers > body fully read
+parse      building the tree of a page (BeautifulSoup)
+extract    pulling the fields out of a page (tree or fast parser)
+write      writing a downloaded file to disk
+```
+"""
+
+from collections import defaultdict
+from threading import Lock
+from time import monotonic, perf_counter
+
+
+class Histogram:
+    """
+    ### Histogram
+    Distribution of durations (seconds) in exponential buckets, from
+    `smallest` up to `smallest * 2 ** (buckets - 1)` (plus an overflow bucket).
+    """
+
+    def __init__(self, smallest: float = 0.0005, buckets: int = 18):
+        self.bounds = [smallest * 2 ** index for index in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, seconds: float):
+        """Records a duration"""
+        index = 0
+        while index < len(self.bounds) and seconds > self.bounds[index]:
+            index += 1
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percent: float):
+        """
+        ### Percentile
+        Returns the (upper bound of the bucket of the) `percent`th percentile,
+        `None` if nothing was recorded.
+        """
+        if not self.count:
+            return None
+
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        """Returns the histogram as a dictionary"""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            # Upper bound (seconds, `inf` for the overflow) > count
+            "buckets": {str(bound): count for bound, count in
+                        zip(self.bounds + [float("inf")], self.counts) if count},
+        }
+
+
+class _Timer:
+    """
+    Times the `with` block it wraps as one `phase` of `stats` (as
+    `failed_phase` if the block raises and it is given)
+    """
+
+    def __init__(self, stats, phase: str, failed_phase: str = None):
+        self.stats = stats
+        self.phase = phase
+        self.failed_phase = failed_phase
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *_):
+        phase = self.phase
+        if exc_type is not None and self.failed_phase:
+            phase = self.failed_phase
+        self.stats.record(phase, perf_counter() - self.started)
+        return False
+
+
+class CrawlStats:
+    """
+    ### Crawl Stats
+    Thread-safe timings (per phase histograms) & counters of a run, readable
+    while it is running with `snapshot()`.
+
+    ```
+    with stats.timer("parse"):
+        soup = BeautifulSoup(html, ...)
+    stats.count("image_pages")
+    ```
+
+    Hooks (see `add_hook`) are called as `hook(event, **fields)`:
+    `"timing"` with `phase` & `seconds` after every timed phase and
+    `"finish"` with `stats` (the snapshot) when the run finishes.
+    """
+
+    PHASES = ("connect", "ttfb", "transfer", "parse", "extract", "write")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.hooks = []
+        self.reset()
+
+    def reset(self):
+        """
+        ### Reset
+        Clears every timing & counter and starts a new run.
+        """
+        with self._lock:
+            self.histograms = {phase: Histogram() for phase in self.PHASES}
+            self.counters = defaultdict(int)
+            self.started = monotonic()
+            self.finished = None
+
+    def timer(self, phase: str, failed_phase: str = None):
+        """
+        Returns a context manager timing its block as `phase`, or as
+        `failed_phase` (if given) when the block raises
+        """
+        return _Timer(self, phase, failed_phase)
+
+    def record(self, phase: str, seconds: float):
+        """Records `seconds` spent in `phase`"""
+        with self._lock:
+            if phase not in self.histograms:
+                self.histograms[phase] = Histogram()
+            self.histograms[phase].add(seconds)
+
+        self._call_hooks("timing", phase=phase, seconds=seconds)
+
+    def count(self, counter: str, amount: int = 1):
+        """Adds `amount` to `counter`"""
+        with self._lock:
+            self.counters[counter] += amount
+
+    def finish(self):
+        """
+        ### Finish
+        Marks the run as finished (freezes its elapsed time) and calls the
+        hooks with the final snapshot.
+        """
+        with self._lock:
+            self.finished = monotonic()
+        self._call_hooks("finish", stats=self.snapshot())
+
+    def add_hook(self, hook):
+        """Calls `hook(event, **fields)` on every timing & when the run finishes"""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Stops calling `hook`"""
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def elapsed(self):
+        """Returns the seconds since the run started (until it finished)"""
+        return (self.finished or monotonic()) - self.started
+
+    def snapshot(self):
+        """
+        ### Snapshot
+        Returns the counters, their rates (per second) & every phase's
+        histogram as a (json serializable) dictionary.
+        """
+        with self._lock:
+            elapsed = self.elapsed()
+            counters = dict(self.counters)
+            return {
+                "elapsed": elapsed,
+                "running": self.finished is None,
+                "counters": counters,
+                "rates": {counter: value / elapsed if elapsed else 0.0
+                          for counter, value in counters.items()},
+                "phases": {phase: histogram.snapshot()
+                           for phase, histogram in self.histograms.items()},
+            }
+
+    def _call_hooks(self, event: str, **fields):
+        """Calls every hook, a failing hook never breaks the run"""
+        for hook in list(self.hooks):
+            try:
+                hook(event, **fields)
+            except Exception as e:
+                print(e)
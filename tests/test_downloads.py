@@ -0,0 +1,76 @@
+"""
+Planned downloads into a folder (`Backend.download_images` & its manifest),
+run against the local replay server (`benchmarks/replay_server.py`).
+
+> `python -m pytest -q tests` or `python -m unittest discover tests`
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from threading import Event
+
+# Modules of this project live in the parent directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from backend import Backend  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+
+
+class DownloadImagesTest(unittest.TestCase):
+    IMAGES = 3
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ReplayServer(images=cls.IMAGES).start()
+        backend = Backend(cache_dir=None, journal_dir=None)
+        cls.images = backend.get_response(cls.server.album_url, Event(), resume=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.save_path = tempfile.mkdtemp(prefix="imgcrawler-save-")
+        self.backend = Backend(cache_dir=None, journal_dir=None)
+
+    def tearDown(self):
+        for manifest in self.backend._manifests.values():
+            manifest.close()
+        shutil.rmtree(self.save_path, ignore_errors=True)
+
+    def write(self, filename: str, content: bytes):
+        with open(os.path.join(self.save_path, filename), "wb") as file:
+            file.write(content)
+
+    def read(self, filename: str):
+        with open(os.path.join(self.save_path, filename), "rb") as file:
+            return file.read()
+
+    def test_leftover_files_are_adopted_only_if_whole(self):
+        # Files saved before the folder had a manifest
+        truncated = self.server.image_payload("0.jpg")[:10]
+        whole = self.server.image_payload("1.jpg")
+        self.write("Image 0.jpg", truncated)
+        self.write("Image 1.jpg", whole)
+
+        self.backend.download_images(self.images, "High Quality",
+                                     self.save_path, Event())
+
+        self.assertEqual(self.read("Image 0.jpg"), self.server.image_payload("0.jpg"))
+        self.assertEqual(self.read("Image 1.jpg"), whole)
+        stats = self.backend.download_stats.snapshot()['counters']
+        self.assertEqual(stats['skipped_images'], 1)
+        self.assertEqual(stats['images'], 2)
+
+        report = self.backend.get_missing_report(self.save_path, verify=True)
+        self.assertEqual(report['summary']['complete'], self.IMAGES)
+        self.assertEqual(report['missing'], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Page cache of the scraper (`httpcache.HttpCache`), run against the local replay
+server (`benchmarks/replay_server.py`).
+
+> `python -m pytest -q tests` or `python -m unittest discover tests`
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from threading import Event
+from requests.exceptions import HTTPError
+
+# Modules of this project live in the parent directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from httpcache import HttpCache  # noqa: E402
+from imgpile import ImgPile  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+from retry import RetryPolicy  # noqa: E402
+
+
+class FlakyServer(ReplayServer):
+    """Answers the paths in `failing` with `503 Service Unavailable`"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failing = set()
+
+    def respond(self, path: str):
+        if path in self.failing:
+            return 503, "text/plain", b"Service Unavailable"
+        return super().respond(path)
+
+
+class HttpCacheTest(unittest.TestCase):
+    IMAGES = 100
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FlakyServer(images=cls.IMAGES).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="imgcrawler-cache-")
+        self.cache = HttpCache(self.cache_dir)
+
+    def tearDown(self):
+        self.server.failing.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def scrape(self):
+        # No retries, a failing page fails right away
+        api = ImgPile(cache=self.cache, retry=RetryPolicy(max_attempts=1))
+        return api.get(self.server.album_url, Event())
+
+    def test_unchanged_pages_are_revalidated(self):
+        self.assertEqual(len(self.scrape()), self.IMAGES)
+
+        self.assertEqual(len(self.scrape()), self.IMAGES)
+        self.assertGreater(self.cache.revalidated, 0)
+
+    def test_error_page_keeps_the_cached_parse(self):
+        self.assertEqual(len(self.scrape()), self.IMAGES)
+
+        # The error page is neither stored nor parsed into the cached entry
+        self.server.failing.add("/album/1")
+        with self.assertRaises(HTTPError):
+            self.scrape()
+        self.server.failing.clear()
+
+        revalidated = self.cache.revalidated
+        self.assertEqual(len(self.scrape()), self.IMAGES)
+        self.assertGreater(self.cache.revalidated, revalidated)
+
+
+if __name__ == "__main__":
+    unittest.main()
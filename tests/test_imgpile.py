@@ -0,0 +1,129 @@
+"""
+Listing walk of the scrapers (`imgpile.ImgPile` & `asyncimgpile.AsyncImgPile`),
+run against the local replay server (`benchmarks/replay_server.py`).
+
+> `python -m pytest -q tests` or `python -m unittest discover tests`
+"""
+
+import aiohttp
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from threading import Event
+from time import sleep
+from requests.exceptions import HTTPError, Timeout
+
+# Modules of this project live in the parent directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from backend import Backend  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+from retry import RetryPolicy  # noqa: E402
+
+
+class FaultyServer(ReplayServer):
+    """
+    Answers the paths in `slow` after `delay` seconds and the paths in
+    `failing` (path > status) with an error status
+    """
+
+    def __init__(self, *args, delay: float = 1.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.slow = set()
+        self.failing = {}
+
+    def respond(self, path: str):
+        if path in self.slow:
+            sleep(self.delay)
+        if path in self.failing:
+            return self.failing[path], "text/plain", b"Error"
+        return super().respond(path)
+
+
+class ListingFailureTest(unittest.TestCase):
+    IMAGES = 100
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FaultyServer(images=cls.IMAGES).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.journal_dir = tempfile.mkdtemp(prefix="imgcrawler-journals-")
+        # Read timeout well below the delay of a slow page, no retries
+        self.backend = Backend(cache_dir=None, journal_dir=self.journal_dir,
+                               timeout=(2, 0.3))
+        self.backend.img_api.retry = RetryPolicy(max_attempts=1)
+        self.backend.get_async_api().retry = RetryPolicy(max_attempts=1)
+
+    def tearDown(self):
+        self.server.slow.clear()
+        self.server.failing.clear()
+        shutil.rmtree(self.journal_dir, ignore_errors=True)
+
+    def assertListingFails(self, scrape, journaled=True, errors=None):
+        if errors is None:
+            self.server.slow.add("/album/2")
+            # `requests` (sync) or `aiohttp` (async) timeout
+            errors = (Timeout, asyncio.TimeoutError)
+        with self.assertRaises(errors):
+            scrape()
+        if journaled:
+            # The checkpoint is kept to resume from
+            self.assertTrue(os.listdir(self.journal_dir))
+
+    def test_complete_album(self):
+        images = self.backend.get_response(self.server.album_url, Event())
+        self.assertEqual(len(images), self.IMAGES)
+        self.assertFalse(os.listdir(self.journal_dir))
+
+    def test_listing_timeout_raises(self):
+        self.assertListingFails(lambda: self.backend.get_response(
+            self.server.album_url, Event()))
+
+    def test_listing_timeout_raises_sequentially(self):
+        api = self.backend.img_api
+        self.assertListingFails(lambda: api.get(
+            self.server.album_url, Event(), concurrent=False), journaled=False)
+
+    def test_listing_timeout_raises_incrementally(self):
+        self.assertListingFails(lambda: self.backend.get_incremental_response(
+            self.server.album_url, Event(), snapshot=[]))
+
+    def test_listing_timeout_raises_async(self):
+        self.assertListingFails(lambda: self.backend.get_response(
+            self.server.album_url, Event(), engine="async"))
+
+    def test_listing_error_status_raises(self):
+        for status in (404, 503):
+            self.server.failing["/album/2"] = status
+            self.assertListingFails(lambda: self.backend.get_response(
+                self.server.album_url, Event()), errors=HTTPError)
+
+    def test_listing_error_status_raises_async(self):
+        self.server.failing["/album/2"] = 404
+        self.assertListingFails(lambda: self.backend.get_response(
+            self.server.album_url, Event(), engine="async"),
+            errors=aiohttp.ClientResponseError)
+
+    def test_failed_images_are_reported(self):
+        self.server.failing["/i/5"] = 404
+        for engine in ("sync", "async"):
+            images = self.backend.get_response(self.server.album_url, Event(),
+                                               engine=engine)
+            self.assertEqual(len(images), self.IMAGES - 1)
+            self.assertEqual(self.backend.get_api(engine).failed_links,
+                             [f"{self.server.base}/i/5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+State machine of the download queue (`jobqueue.DownloadQueue`), run against
+the local replay server (`benchmarks/replay_server.py`).
+
+> `python -m pytest -q tests` or `python -m unittest discover tests`
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from threading import Event
+
+# Modules of this project live in the parent directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from backend import Backend  # noqa: E402
+from replay_server import ReplayServer  # noqa: E402
+
+
+class DownloadQueueTest(unittest.TestCase):
+    IMAGES = 30
+
+    @classmethod
+    def setUpClass(cls):
+        # Slow enough for a pause to land while images are in flight
+        cls.server = ReplayServer(images=cls.IMAGES, bandwidth=256 * 1024).start()
+        backend = Backend(cache_dir=None, journal_dir=None)
+        cls.images = backend.get_response(cls.server.album_url, Event(), resume=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.state_dir = tempfile.mkdtemp(prefix="imgcrawler-queue-")
+        self.save_path = tempfile.mkdtemp(prefix="imgcrawler-save-")
+        self.backend = Backend(cache_dir=None, journal_dir=None)
+        self.queue = self.backend.open_download_queue(self.state_dir, workers=4)
+
+    def tearDown(self):
+        self.queue.stop()
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        shutil.rmtree(self.save_path, ignore_errors=True)
+
+    def saved_images(self):
+        return [name for name in os.listdir(self.save_path) if name.endswith(".jpg")]
+
+    def test_job_finishes(self):
+        job_id = self.queue.add(self.images, self.save_path)
+
+        self.assertTrue(self.queue.wait(30))
+        job = self.queue.get(job_id)
+        self.assertEqual(job['state'], "done")
+        self.assertEqual(job['completed'], self.IMAGES)
+        self.assertEqual(len(self.saved_images()), self.IMAGES)
+
+    def test_paused_job_resumes_and_finishes(self):
+        job_id = self.queue.add(self.images, self.save_path)
+        # Planned & some images downloading
+        self.queue.wait(0.5)
+        self.queue.pause(job_id)
+        self.assertEqual(self.queue.get(job_id)['state'], "paused")
+        # A paused job doesn't hold the queue busy
+        self.assertTrue(self.queue.wait(5))
+
+        self.queue.resume(job_id)
+        self.assertIn(self.queue.get(job_id)['state'], ("queued", "running"))
+        self.assertTrue(self.queue.wait(30))
+
+        job = self.queue.get(job_id)
+        self.assertEqual(job['state'], "done")
+        self.assertEqual(job['pending'], 0)
+        self.assertEqual(job['completed'], self.IMAGES)
+        self.assertEqual(len(self.saved_images()), self.IMAGES)
+
+    def test_paused_before_planning(self):
+        job_id = self.queue.add(self.images, self.save_path, paused=True)
+        self.assertTrue(self.queue.wait(1))
+        self.assertEqual(self.queue.get(job_id)['state'], "paused")
+
+        self.queue.resume(job_id)
+        self.assertTrue(self.queue.wait(30))
+        self.assertEqual(self.queue.get(job_id)['state'], "done")
+
+    def test_running_job_continues_after_restart(self):
+        job_id = self.queue.add(self.images, self.save_path)
+        self.queue.wait(0.5)
+        self.queue.stop()
+
+        backend = Backend(cache_dir=None, journal_dir=None)
+        self.queue = backend.open_download_queue(self.state_dir, workers=4)
+        self.assertTrue(self.queue.wait(30))
+        job = self.queue.get(job_id)
+        self.assertEqual(job['state'], "done")
+        self.assertEqual(job['completed'], self.IMAGES)
+
+
+if __name__ == "__main__":
+    unittest.main()